@@ -1,14 +1,116 @@
-from django.contrib import admin
+from functools import partial
 
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db.models.functions import Substr
+from django.forms.models import BaseInlineFormSet
+from django.template.response import TemplateResponse
+
+from .constants import (
+    ADMIN_TEXT_PREVIEW_LENGTH, CATEGORY_INLINE_POSTS_PER_PAGE
+)
 from .models import Category, Comment, Location, Post
+from .pagination import CachedCountPaginator, approximate_count
+from .search import search_posts
+from .services import bulk_delete_posts, bulk_update_posts
 
 admin.site.empty_value_display = 'Не задано'
 
 
-class PostAdmin(admin.ModelAdmin):
+class InputFilter(admin.SimpleListFilter):
+    """Фильтр с полем ввода вместо списка всех возможных значений."""
+
+    template = 'admin/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        yield {
+            'value': self.value() or '',
+            'query_parts': [
+                (key, value)
+                for key, value in changelist.params.items()
+                if key not in (self.parameter_name, 'p')
+            ],
+            'reset_query_string': changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+        }
+
+
+class AuthorFilter(InputFilter):
+    title = 'автору'
+    parameter_name = 'author'
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(author__username=self.value())
+        return queryset
+
+
+class PostFilter(InputFilter):
+    title = 'id публикации'
+    parameter_name = 'post'
+
+    def queryset(self, request, queryset):
+        if self.value() and self.value().isdigit():
+            return queryset.filter(post_id=self.value())
+        return queryset
+
+
+class PreviewChangeList(ChangeList):
+    """Список, в котором длинный текст обрезается на стороне СУБД."""
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer(
+            *self.model_admin.list_defer
+        ).annotate(
+            text_preview=Substr('text', 1, ADMIN_TEXT_PREVIEW_LENGTH)
+        )
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Админка таблицы, в которой могут быть миллионы строк."""
+
+    list_defer = ('text',)
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return PreviewChangeList
+
+    def get_paginator(self, request, queryset, per_page, **kwargs):
+        return CachedCountPaginator(
+            queryset, per_page, partial(
+                approximate_count,
+                threshold=settings.ADMIN_COUNT_APPROXIMATE_THRESHOLD
+            ), **kwargs
+        )
+
+    @admin.display(description='Текст')
+    def short_text(self, obj):
+        if len(obj.text_preview) < ADMIN_TEXT_PREVIEW_LENGTH:
+            return obj.text_preview
+        return obj.text_preview + '…'
+
+
+class MoveToCategoryForm(forms.Form):
+    category = forms.ModelChoiceField(
+        Category.objects.all(), label='Категория'
+    )
+
+
+class PostAdmin(LargeTableAdmin):
     list_display = (
         'title',
-        'text',
+        'short_text',
         'location',
         'is_published',
         'category',
@@ -19,15 +121,144 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
         'category',
     )
-    search_fields = ('title',)
-    list_filter = ('category', 'author',)
+    list_select_related = ('location', 'category', 'author')
+    search_fields = ('title', 'text')
+    list_filter = ('category', AuthorFilter)
     list_display_links = ('title',)
+    autocomplete_fields = ('author', 'location')
+    actions = (
+        'publish', 'unpublish', 'move_to_category', 'delete_with_comments'
+    )
+
+    def get_actions(self, request):
+        """delete_selected удаляет по одной — его заменяет bulk-действие."""
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def confirm_action(self, request, queryset, title, form=None):
+        """Страница подтверждения действия над выбранными публикациями."""
+        return TemplateResponse(request, 'admin/bulk_action.html', {
+            **self.admin_site.each_context(request),
+            'title': title,
+            'opts': self.model._meta,
+            'form': form,
+            'count': queryset.count(),
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'action': request.POST['action'],
+            'select_across': request.POST.get('select_across', '0'),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        })
+
+    @admin.action(
+        description='Опубликовать выбранные публикации',
+        permissions=('change',)
+    )
+    def publish(self, request, queryset):
+        self.message_user(request, 'Опубликовано публикаций: {}.'.format(
+            bulk_update_posts(queryset, is_published=True)
+        ), messages.SUCCESS)
+
+    @admin.action(
+        description='Снять с публикации выбранные публикации',
+        permissions=('change',)
+    )
+    def unpublish(self, request, queryset):
+        self.message_user(request, 'Снято с публикации: {}.'.format(
+            bulk_update_posts(queryset, is_published=False)
+        ), messages.SUCCESS)
 
+    @admin.action(
+        description='Перенести выбранные публикации в категорию',
+        permissions=('change',)
+    )
+    def move_to_category(self, request, queryset):
+        form = MoveToCategoryForm(request.POST if 'apply' in request.POST
+                                  else None)
+        if not form.is_valid():
+            return self.confirm_action(
+                request, queryset, 'Перенос публикаций в категорию', form
+            )
+        category = form.cleaned_data['category']
+        self.message_user(
+            request, 'Перенесено в «{}» публикаций: {}.'.format(
+                category, bulk_update_posts(queryset, category=category)
+            ), messages.SUCCESS
+        )
+
+    @admin.action(
+        description='Удалить выбранные публикации с комментариями',
+        permissions=('delete',)
+    )
+    def delete_with_comments(self, request, queryset):
+        if 'apply' not in request.POST:
+            return self.confirm_action(
+                request, queryset, 'Удаление публикаций с комментариями'
+            )
+        posts, comments = bulk_delete_posts(queryset)
+        self.message_user(
+            request,
+            f'Удалено публикаций: {posts}, комментариев: {comments}.',
+            messages.SUCCESS
+        )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        """Варианты категорий в строках списка читаются из БД один раз."""
+        field = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if db_field.name == 'category':
+            if not hasattr(request, 'category_choices'):
+                request.category_choices = list(field.choices)
+            field.choices = request.category_choices
+        return field
+
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по полнотекстовому индексу вместо LIKE по полям."""
+        if not search_term.strip():
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
+
+class PostInLineFormSet(BaseInlineFormSet):
+    """Формы только для одной страницы публикаций категории."""
+
+    page_number = 1
+
+    def get_queryset(self):
+        if not hasattr(self, 'page'):
+            self.page = Paginator(
+                super().get_queryset(), CATEGORY_INLINE_POSTS_PER_PAGE
+            ).get_page(self.page_number)
+        return self.page.object_list
+
+
+class PostInLine(admin.TabularInline):
+    """Постраничный список публикаций категории только для чтения."""
 
-class PostInLine(admin.StackedInline):
     model = Post
+    formset = PostInLineFormSet
+    template = 'admin/post_inline.html'
+    page_parameter = 'posts_page'
+    fields = ('title', 'author', 'pub_date', 'is_published')
+    readonly_fields = fields
+    ordering = ('-pub_date',)
+    show_change_link = True
+    can_delete = False
     extra = 0
 
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('author').only(
+            'title', 'pub_date', 'is_published', 'category',
+            'author__username'
+        )
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.page_number = request.GET.get(self.page_parameter)
+        return formset
+
 
 class CategoryAdmin(admin.ModelAdmin):
     inlines = (PostInLine,)
@@ -52,15 +283,18 @@ class LocationAdmin(admin.ModelAdmin):
     list_filter = ('is_published',)
 
 
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(LargeTableAdmin):
     list_display = (
-        'text',
+        'short_text',
         'post',
         'created_at',
         'author',
     )
+    list_defer = ('text', 'post__text')
+    list_select_related = ('post', 'author')
     search_fields = ('text',)
-    list_filter = ('post',)
+    list_filter = (PostFilter,)
+    autocomplete_fields = ('post', 'author')
 
 
 admin.site.register(Post, PostAdmin)
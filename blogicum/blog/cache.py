@@ -0,0 +1,247 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.db.models import Min
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from core.caching import COUNTS, PAGES, cache_lock, get_or_compute
+
+from .clock import publication_clock
+from .constants import FEED_COUNT_CACHE_TIMEOUT
+from .models import Post
+from .pagination import approximate_count
+
+ALL_FEEDS = 'all'
+INDEX_FEED = 'index'
+
+FEED_VERSION_KEY = 'blog:feed-version:{}'
+FEED_COUNT_KEY = 'blog:feed-count:{}'
+FEED_PAGE_KEY = 'blog:feed-page:{}:{}'
+NEXT_PUBLICATION_KEY = 'blog:next-publication'
+NO_SCHEDULED_POSTS = float('inf')
+
+
+def category_feed(category_slug):
+    return f'category:{category_slug}'
+
+
+def author_feed(username, own=False):
+    """Лента автора; own — лента, которую видит сам автор."""
+    if own:
+        return f'author:{username}:own'
+    return f'author:{username}'
+
+
+def post_feed(post_id):
+    """Страница поста: версия меняется с постом и его комментариями."""
+    return f'post:{post_id}'
+
+
+def post_feeds(username, *category_slugs):
+    """Ленты, в которых показывается публикация."""
+    feeds = [INDEX_FEED, author_feed(username), author_feed(username, True)]
+    feeds.extend(
+        category_feed(slug) for slug in set(category_slugs)
+        if slug is not None
+    )
+    return feeds
+
+
+def schedule_publication(pub_date):
+    """Запоминает момент, когда отложенная публикация станет видна.
+
+    Отметка понижается после фиксации транзакции и под той же
+    блокировкой, что и пересчёт в release_scheduled_posts: пересчёт
+    либо уже видит пост в базе, либо завершится раньше и не затрёт
+    более раннюю отметку.
+    """
+    if pub_date < publication_clock():
+        return
+    timestamp = pub_date.timestamp()
+
+    def lower_next_publication():
+        with cache_lock(cache, NEXT_PUBLICATION_KEY):
+            next_publication = cache.get(NEXT_PUBLICATION_KEY)
+            if next_publication is not None and timestamp < next_publication:
+                cache.set(NEXT_PUBLICATION_KEY, timestamp, None)
+
+    transaction.on_commit(lower_next_publication)
+
+
+def upcoming_publication(clock):
+    """Отметка времени ближайшей отложенной публикации."""
+    upcoming = Post.objects.filter(pub_date__gte=clock).aggregate(
+        Min('pub_date')
+    )['pub_date__min']
+    return upcoming.timestamp() if upcoming else NO_SCHEDULED_POSTS
+
+
+def release_scheduled_posts(next_publication):
+    """Сбрасывает ленты публикаций, срок которых наступил.
+
+    next_publication — отметка времени ближайшей отложенной публикации
+    или None, если она неизвестна (тогда сбрасываются все ленты).
+    Возвращает отметку времени следующей отложенной публикации.
+    """
+    clock = publication_clock()
+    if next_publication is None:
+        bump_feed_versions(ALL_FEEDS)
+    elif next_publication < clock.timestamp():
+        released = Post.objects.filter(
+            pub_date__gte=datetime.fromtimestamp(
+                next_publication, tz=timezone.utc
+            ),
+            pub_date__lt=clock,
+        ).values_list('author__username', 'category__slug')
+        bump_feed_versions(*{
+            feed for post in released for feed in post_feeds(*post)
+        })
+    else:
+        return next_publication
+    with cache_lock(cache, NEXT_PUBLICATION_KEY):
+        next_publication = upcoming_publication(clock)
+        cache.set(NEXT_PUBLICATION_KEY, next_publication, None)
+    return next_publication
+
+
+def get_feed_version(feed):
+    """Версия ленты — отметка времени (мс) её последнего изменения.
+
+    Изменение, затрагивающее все ленты, поднимает версию ALL_FEEDS,
+    поэтому версией ленты считается большая из двух. Наступление срока
+    отложенной публикации тоже поднимает версии затронутых лент.
+    """
+    keys = [FEED_VERSION_KEY.format(ALL_FEEDS), FEED_VERSION_KEY.format(feed)]
+    versions = cache.get_many(keys + [NEXT_PUBLICATION_KEY])
+    next_publication = versions.pop(NEXT_PUBLICATION_KEY, None)
+    if release_scheduled_posts(next_publication) != next_publication:
+        versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, int(time.time() * 1000), None)
+            versions[key] = cache.get(key)
+    return max(versions.values())
+
+
+def bump_feed_versions(*feeds):
+    keys = [FEED_VERSION_KEY.format(feed) for feed in feeds]
+    current = cache.get_many(keys)
+    now = int(time.time() * 1000)
+    cache.set_many(
+        {key: max(now, current.get(key, 0) + 1) for key in keys}, None
+    )
+
+
+def get_feed_count(feed, queryset):
+    """Число публикаций в ленте, закешированное до её изменения.
+
+    Если задан FEED_COUNT_APPROXIMATE_THRESHOLD, то для лент больше
+    порога используется оценка планировщика вместо COUNT(*).
+    """
+    return get_or_compute(
+        caches[COUNTS],
+        FEED_COUNT_KEY.format(feed),
+        lambda: approximate_count(
+            queryset,
+            getattr(settings, 'FEED_COUNT_APPROXIMATE_THRESHOLD', None)
+        ),
+        FEED_COUNT_CACHE_TIMEOUT,
+        version=get_feed_version(feed),
+    )
+
+
+def cache_anonymous_page(feed_func):
+    """Кеширует страницу ленты для анонимных посетителей.
+
+    Ключ строится из пути и параметров пагинации, а версия ленты
+    feed_func(**kwargs) сбрасывает все её страницы при изменениях.
+    Включается настройкой ANONYMOUS_PAGE_CACHE_TIMEOUT.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            timeout = getattr(settings, 'ANONYMOUS_PAGE_CACHE_TIMEOUT', 0)
+            if (
+                not timeout
+                or request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+            feed = feed_func(**kwargs)
+            location = hashlib.md5('|'.join((
+                request.path,
+                request.GET.get('page', ''),
+                request.GET.get('cursor', ''),
+            )).encode()).hexdigest()
+            return get_or_compute(
+                caches[PAGES],
+                FEED_PAGE_KEY.format(feed, location),
+                lambda: view(request, *args, **kwargs),
+                timeout,
+                version=get_feed_version(feed),
+                cacheable=lambda response: (
+                    response.status_code == 200 and not response.cookies
+                ),
+            )
+        return wrapper
+    return decorator
+
+
+def conditional_page(feed_func):
+    """Отвечает 304 на условный GET, если страница не менялась.
+
+    ETag строится из версии ленты feed_func(**kwargs), пользователя,
+    его CSRF-токена и адреса страницы — без запросов ленты к БД;
+    Last-Modified — из версии ленты, и только для анонимных посетителей.
+    Если feed_func вернула None, страница отдаётся без проверки.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            feed = (
+                feed_func(**kwargs)
+                if request.method in ('GET', 'HEAD') else None
+            )
+            if feed is None:
+                return view(request, *args, **kwargs)
+            version = get_feed_version(feed)
+            # Вошедшему страница отдаётся с формами: CSRF-токен меняется
+            # при каждом входе, и ответ со старым токеном не годится.
+            csrf_cookie = ''
+            if request.user.is_authenticated:
+                get_token(request)
+                csrf_cookie = request.META['CSRF_COOKIE']
+            etag = quote_etag(hashlib.md5('|'.join((
+                feed,
+                str(version),
+                str(request.user.pk),
+                request.user.get_username(),
+                csrf_cookie,
+                request.get_full_path(),
+            )).encode()).hexdigest())
+            # Last-Modified не различает пользователей, поэтому
+            # страницы, отрисованные для вошедшего, его не получают.
+            last_modified = (
+                None if request.user.is_authenticated else version // 1000
+            )
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, no_cache=True)
+            return response
+        return wrapper
+    return decorator
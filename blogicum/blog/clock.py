@@ -0,0 +1,21 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.utils.timezone import now
+
+
+def publication_clock():
+    """Текущее время, округлённое вниз до PUBLICATION_CLOCK_GRANULARITY.
+
+    Одинаковое значение в пределах интервала делает SQL лент
+    повторяющимся и пригодным для кеширования; округление вниз
+    гарантирует, что отложенная публикация не появится раньше срока.
+    """
+    current = now()
+    granularity = getattr(settings, 'PUBLICATION_CLOCK_GRANULARITY', 0)
+    if not granularity:
+        return current
+    timestamp = current.timestamp()
+    return datetime.fromtimestamp(
+        timestamp - timestamp % granularity, tz=timezone.utc
+    )
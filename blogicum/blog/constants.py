@@ -1,3 +1,14 @@
 MAX_LENGTH = 256
 OUTPUT_SLICE = 20
 POSTS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 50
+FEED_COUNT_CACHE_TIMEOUT = 60 * 60
+THUMBNAIL_WIDTHS = (320, 640, 1280)
+THUMBNAIL_QUALITY = 80
+MAX_IMAGE_UPLOAD_SIZE = 10 * 1024 * 1024
+MAX_IMAGE_PIXELS = 40_000_000
+MAX_IMAGE_SIDE = 10_000
+REENCODED_IMAGE_QUALITY = 95
+ADMIN_TEXT_PREVIEW_LENGTH = 50
+CATEGORY_INLINE_POSTS_PER_PAGE = 20
+BULK_BATCH_SIZE = 1000
@@ -1,11 +1,116 @@
+import shutil
+import tempfile
+import warnings
+
 from django import forms
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.utils import timezone
+from PIL import Image, ImageOps
 
+from .constants import (
+    MAX_IMAGE_PIXELS, MAX_IMAGE_SIDE, MAX_IMAGE_UPLOAD_SIZE,
+    REENCODED_IMAGE_QUALITY
+)
 from .models import Comment, Post
 
 User = get_user_model()
 
+METADATA_KEYS = ('exif', 'xmp', 'XML:com.adobe.xmp', 'comment', 'photoshop')
+EXIF_ORIENTATION = 0x0112
+LOSSY_FORMATS = ('JPEG', 'WEBP')
+
+
+class BoundedImageField(forms.ImageField):
+    """Поле изображения с проверкой размеров до полного декодирования.
+
+    Размер файла и габариты картинки проверяются по заголовку, поэтому
+    «бомба» отклоняется, не занимая память. Метаданные (EXIF и т.п.)
+    вырезаются пересохранением во временный файл.
+    """
+
+    default_error_messages = {
+        'too_large': 'Файл больше %(limit)s МБ.',
+        'too_many_pixels': 'Изображение больше %(side)s пикселей по стороне'
+                           ' или %(pixels)s мегапикселей.',
+    }
+
+    def to_python(self, data):
+        upload = forms.FileField.to_python(self, data)
+        if upload is None:
+            return None
+        if upload.size > MAX_IMAGE_UPLOAD_SIZE:
+            raise ValidationError(
+                self.error_messages['too_large'],
+                code='too_large',
+                params={'limit': MAX_IMAGE_UPLOAD_SIZE // (1024 * 1024)},
+            )
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error', Image.DecompressionBombWarning)
+                image = Image.open(upload)
+                width, height = image.size
+                if (
+                    max(width, height) > MAX_IMAGE_SIDE
+                    or width * height > MAX_IMAGE_PIXELS
+                ):
+                    raise ValidationError(
+                        self.error_messages['too_many_pixels'],
+                        code='too_many_pixels',
+                        params={
+                            'side': MAX_IMAGE_SIDE,
+                            'pixels': MAX_IMAGE_PIXELS // 10 ** 6,
+                        },
+                    )
+                image.verify()
+                upload.seek(0)
+                image = Image.open(upload)
+                if any(key in image.info for key in METADATA_KEYS):
+                    upload = self.strip_metadata(upload, image)
+                    image = Image.open(upload)
+        except ValidationError:
+            raise
+        except Exception as exc:
+            raise ValidationError(
+                self.error_messages['invalid_image'],
+                code='invalid_image',
+            ) from exc
+        upload.image = image
+        upload.content_type = Image.MIME.get(image.format)
+        upload.seek(0)
+        return upload
+
+    @staticmethod
+    def strip_metadata(upload, image):
+        """Пересохраняет изображение без метаданных.
+
+        Поворот из EXIF Orientation переносится в пиксели, иначе снимки
+        с телефона без EXIF показывались бы повёрнутыми. Анимации
+        сохраняются со всеми кадрами. Результат пишется во временный
+        файл и по частям копируется обратно в загрузку.
+        """
+        image_format = image.format
+        options = {'exif': b'', 'comment': b''}
+        if getattr(image, 'n_frames', 1) > 1:
+            options['save_all'] = True
+        elif image.getexif().get(EXIF_ORIENTATION, 1) != 1:
+            image = ImageOps.exif_transpose(image)
+            if image_format in LOSSY_FORMATS:
+                options['quality'] = REENCODED_IMAGE_QUALITY
+        elif image_format == 'JPEG':
+            options['quality'] = 'keep'
+        if 'icc_profile' in image.info:
+            options['icc_profile'] = image.info['icc_profile']
+        with tempfile.TemporaryFile() as stripped:
+            image.save(stripped, image_format, **options)
+            stripped.seek(0)
+            upload.seek(0)
+            upload.truncate()
+            shutil.copyfileobj(stripped, upload)
+        upload.size = upload.tell()
+        upload.seek(0)
+        return upload
+
 
 class PostForm(forms.ModelForm):
     """Форма публикации."""
@@ -19,6 +124,7 @@ class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         exclude = ('author', 'is_published')
+        field_classes = {'image': BoundedImageField}
         widgets = {
             'pub_date': forms.DateTimeInput(
                 format='%Y-%m-%dT%H', attrs={'type': 'datetime-local'}
@@ -0,0 +1,141 @@
+import json
+import platform
+import subprocess
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+
+from blog.models import Category, Post, User
+from blog.services import common_filter
+from core.instrumentation import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет пропускную способность и задержки представлений блога'
+        ' внутри процесса и сохраняет результат в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--output', help='Файл для результатов.')
+        parser.add_argument(
+            '--compare', help='Файл с результатами предыдущего прогона.'
+        )
+        parser.add_argument(
+            '--max-regression', type=float, default=None,
+            help='Допустимый рост p95 в процентах; больше — ошибка.'
+        )
+
+    def scenarios(self):
+        post = common_filter(Post.objects).order_by('-comment_count').first()
+        category = Category.objects.filter(is_published=True).first()
+        if post is None or category is None:
+            raise CommandError(
+                'Нет опубликованных данных; запустите seed_blog.'
+            )
+        author = User.objects.get(pk=post.author_id)
+        reader = Client(HTTP_HOST='localhost')
+        writer = Client(HTTP_HOST='localhost')
+        writer.force_login(author)
+        return {
+            'index': (reader, 'get', '/', None),
+            'index_deep_page': (reader, 'get', '/?page=1000', None),
+            'category_posts': (
+                reader, 'get', f'/category/{category.slug}/', None
+            ),
+            'profile': (reader, 'get', f'/profile/{author.username}/', None),
+            'post_detail': (reader, 'get', f'/posts/{post.id}/', None),
+            'add_comment': (
+                writer, 'post', f'/posts/{post.id}/comment/',
+                {'text': 'Комментарий нагрузочного теста.'}
+            ),
+            'create_post': (
+                writer, 'post', '/posts/create/',
+                {
+                    'title': 'Публикация нагрузочного теста',
+                    'text': 'Текст публикации.',
+                    'pub_date': timezone.localtime().strftime(
+                        '%Y-%m-%dT%H:%M'
+                    ),
+                    'category': category.id,
+                }
+            ),
+        }
+
+    def measure(self, client, method, url, data, requests, warmup):
+        request = getattr(client, method)
+        for _ in range(warmup):
+            request(url, data)
+        timings = []
+        started = perf_counter()
+        for _ in range(requests):
+            start = perf_counter()
+            response = request(url, data)
+            timings.append((perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                raise CommandError(f'{url}: ответ {response.status_code}')
+        total = perf_counter() - started
+        return {
+            'requests': requests,
+            'throughput_rps': round(requests / total, 2),
+            **{
+                f'p{percent}_ms': round(percentile(timings, percent), 3)
+                for percent in (50, 95, 99)
+            },
+        }
+
+    def handle(self, *args, **options):
+        results = {}
+        for name, (client, method, url, data) in self.scenarios().items():
+            results[name] = self.measure(
+                client, method, url, data,
+                options['requests'], options['warmup']
+            )
+            self.stdout.write(f'{name:<16} {results[name]}')
+        report = {
+            'commit': self.commit(),
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+        if options['compare']:
+            self.compare(results, options['compare'],
+                         options['max_regression'])
+
+    def commit(self):
+        try:
+            return subprocess.run(
+                ('git', 'rev-parse', '--short', 'HEAD'),
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def compare(self, results, baseline_path, max_regression):
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = []
+        for name, current in results.items():
+            if name not in baseline:
+                continue
+            before = baseline[name]['p95_ms']
+            change = (current['p95_ms'] - before) / before * 100
+            self.stdout.write(
+                f'{name:<16} p95 {before} -> {current["p95_ms"]} мс'
+                f' ({change:+.1f}%)'
+            )
+            if max_regression is not None and change > max_regression:
+                regressions.append(name)
+        if regressions:
+            raise CommandError(
+                'Рост p95 больше допустимого: ' + ', '.join(regressions)
+            )
@@ -0,0 +1,72 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.thumbnails import image_storage, is_referenced, original_base
+
+UPLOAD_DIRECTORY = Post._meta.get_field('image').upload_to
+
+
+class Command(BaseCommand):
+    help = 'Удаляет файлы изображений, на которые не ссылается ни один пост.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--min-age', type=int, default=60 * 60,
+            help='Не трогать файлы моложе стольких секунд (идут загрузки).'
+        )
+
+    def files(self, storage, min_age):
+        root = storage.path(UPLOAD_DIRECTORY)
+        deadline = time.time() - min_age
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                if os.path.getmtime(path) > deadline:
+                    continue
+                yield os.path.relpath(
+                    path, storage.location
+                ).replace(os.sep, '/')
+
+    def handle(self, *args, **options):
+        storage = image_storage()
+        originals, variants = {}, []
+        for name in self.files(storage, options['min_age']):
+            base = original_base(name)
+            if base is None:
+                originals[os.path.splitext(name)[0]] = name
+            else:
+                variants.append((base, name))
+        orphans = []
+        names = list(originals.values())
+        for start in range(0, len(names), options['batch_size']):
+            batch = names[start:start + options['batch_size']]
+            referenced = set(Post.objects.filter(
+                image__in=batch
+            ).values_list('image', flat=True))
+            orphans.extend(name for name in batch if name not in referenced)
+        if not options['dry_run']:
+            # Оригинал, который загружают заново, остаётся на месте.
+            orphans = [
+                name for name in orphans
+                if storage.delete_unreferenced(name, is_referenced)
+            ]
+        orphan_bases = {os.path.splitext(name)[0] for name in orphans}
+        orphan_variants = [
+            name for base, name in variants
+            if base in orphan_bases or base not in originals
+        ]
+        orphans.extend(orphan_variants)
+        for name in orphans:
+            if options['dry_run']:
+                self.stdout.write(name)
+            elif name in orphan_variants:
+                storage.delete(name)
+        self.stdout.write(
+            f'{"Найдено" if options["dry_run"] else "Удалено"}'
+            f' неиспользуемых файлов: {len(orphans)}'
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.services import reconcile_comment_counts
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает денормализованное число комментариев у постов.'
+
+    def handle(self, *args, **options):
+        fixed = reconcile_comment_counts()
+        self.stdout.write(f'Исправлено постов: {fixed}')
@@ -0,0 +1,124 @@
+import random
+import secrets
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.cache import ALL_FEEDS, bump_feed_versions
+from blog.models import Category, Comment, Location, Post, User
+from blog.services import reconcile_comment_counts
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+class Command(BaseCommand):
+    help = 'Наполняет базу большим объёмом данных для нагрузочных тестов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора: одинаковое зерно — одинаковые данные'
+            ' (кроме суффикса запуска в логинах и slug).'
+        )
+
+    def create(self, model, objects, batch_size):
+        """Вставляет объекты пачками и возвращает список их id.
+
+        PostgreSQL возвращает id из INSERT; в остальных СУБД id пачки
+        перечитываются в той же транзакции — счётчики id не повторяют
+        удалённые значения, поэтому вычислять их нельзя.
+        """
+        ids = []
+        for batch in batched(objects, batch_size):
+            with transaction.atomic():
+                if connection.features.can_return_rows_from_bulk_insert:
+                    created = model.objects.bulk_create(
+                        batch, batch_size=batch_size
+                    )
+                    ids.extend(obj.pk for obj in created)
+                else:
+                    last_id = model.objects.aggregate(
+                        Max('id')
+                    )['id__max'] or 0
+                    model.objects.bulk_create(batch, batch_size=batch_size)
+                    ids.extend(model.objects.filter(
+                        id__gt=last_id
+                    ).order_by('id').values_list('id', flat=True))
+            self.stdout.write(f'{model.__name__}: {len(ids)}', ending='\r')
+        self.stdout.write('')
+        return ids
+
+    def handle(self, *args, **options):
+        rand = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        now = timezone.now()
+        password = make_password('benchmark')
+        # Суффикс запуска: повторный запуск с тем же зерном не упирается
+        # в уникальность slug и логинов.
+        run = f'{options["seed"]}-{secrets.token_hex(4)}'
+
+        categories = self.create(Category, (
+            Category(
+                title=f'Категория {index}',
+                description='Категория для нагрузочного теста.',
+                slug=f'bench-{run}-{index}',
+            )
+            for index in range(options['categories'])
+        ), batch_size)
+        locations = self.create(Location, (
+            Location(name=f'Место {index}')
+            for index in range(options['locations'])
+        ), batch_size)
+        users = self.create(User, (
+            User(
+                username=f'bench_{run}_{index}',
+                password=password,
+            )
+            for index in range(options['users'])
+        ), batch_size)
+        posts = self.create(Post, (
+            Post(
+                title=f'Публикация {index}',
+                text='Текст публикации для нагрузочного теста. ' * 10,
+                pub_date=now - timedelta(minutes=rand.randrange(10 ** 6)),
+                author_id=rand.choice(users),
+                category_id=rand.choice(categories),
+                location_id=rand.choice(locations),
+                is_published=rand.random() > 0.05,
+            )
+            for index in range(options['posts'])
+        ), batch_size)
+        self.create(Comment, (
+            Comment(
+                text='Комментарий для нагрузочного теста.',
+                post_id=rand.choice(posts),
+                author_id=rand.choice(users),
+            )
+            for _ in range(options['comments'])
+        ), batch_size)
+        if posts:
+            reconcile_comment_counts(
+                Post.objects.filter(id__range=(min(posts), max(posts)))
+            )
+        bump_feed_versions(ALL_FEEDS)
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: пользователей {len(users)}, публикаций {len(posts)},'
+            f' комментариев {options["comments"]}.'
+        ))
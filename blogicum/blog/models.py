@@ -1,13 +1,16 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, router, transaction
 
 from .constants import MAX_LENGTH, OUTPUT_SLICE
-from core.models import CreatedAtModel, IsPublishedCreatedAtModel
+from .storage import ContentAddressedStorage
+from core.models import (
+    CreatedAtModel, IsPublishedCreatedAtModel, UpdatedAtModel
+)
 
 User = get_user_model()
 
 
-class Category(IsPublishedCreatedAtModel):
+class Category(IsPublishedCreatedAtModel, UpdatedAtModel):
     title = models.CharField('Заголовок', max_length=MAX_LENGTH)
     description = models.TextField('Описание')
     slug = models.SlugField(
@@ -25,7 +28,7 @@ class Category(IsPublishedCreatedAtModel):
         return self.title[:OUTPUT_SLICE]
 
 
-class Location(IsPublishedCreatedAtModel):
+class Location(IsPublishedCreatedAtModel, UpdatedAtModel):
     name = models.CharField('Название места', max_length=MAX_LENGTH)
 
     class Meta:
@@ -36,8 +39,13 @@ class Location(IsPublishedCreatedAtModel):
         return self.name[:OUTPUT_SLICE]
 
 
-class Post(IsPublishedCreatedAtModel):
-    image = models.ImageField('Фото', upload_to='post_images', blank=True)
+class Post(IsPublishedCreatedAtModel, UpdatedAtModel):
+    image = models.ImageField(
+        'Фото',
+        upload_to='post_images',
+        blank=True,
+        storage=ContentAddressedStorage()
+    )
     title = models.CharField('Заголовок', max_length=MAX_LENGTH)
     text = models.TextField('Текст')
     pub_date = models.DateTimeField('Дата и время публикации',
@@ -65,15 +73,51 @@ class Post(IsPublishedCreatedAtModel):
         verbose_name='Категория',
         related_name='posts'
     )
+    comment_count = models.PositiveIntegerField(
+        'Число комментариев',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                name='post_published_feed_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_feed_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title[:OUTPUT_SLICE]
 
+    def delete(self, using=None, keep_parents=False):
+        """Удаляет публикацию, комментарии — одним DELETE без сигналов.
+
+        Счётчик и ленты публикации обновлять незачем: её post_delete
+        и так сбрасывает ленты.
+        """
+        using = using or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            comments = self.comments.all()._raw_delete(using)
+            deleted, per_model = super().delete(using, keep_parents)
+        if comments:
+            deleted += comments
+            per_model[Comment._meta.label] = comments
+        return deleted, per_model
+
 
 class Comment(CreatedAtModel):
     text = models.TextField('Текст комментария')
@@ -0,0 +1,181 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+NEXT = 'next'
+PREVIOUS = 'prev'
+
+
+def estimate_count(queryset):
+    """Оценка числа строк по плану запроса PostgreSQL.
+
+    Для остальных СУБД оценки нет — возвращается None.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = queryset.explain(format='json')
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def approximate_count(queryset, threshold=None):
+    """Число строк: оценка планировщика, если она не меньше threshold.
+
+    Без порога или без оценки выполняется обычный COUNT(*).
+    """
+    if threshold is not None:
+        count = estimate_count(queryset)
+        if count is not None and count >= threshold:
+            return count
+    return queryset.count()
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор, получающий общее число объектов от count_func."""
+
+    def __init__(self, object_list, per_page, count_func, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_func = count_func
+
+    @cached_property
+    def count(self):
+        return self.count_func(self.object_list)
+
+
+class KeysetPage(Sequence):
+    """Страница ленты, построенная по курсору, без COUNT и OFFSET."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if self.has_next():
+            return self.paginator.encode_cursor(NEXT, self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous():
+            return self.paginator.encode_cursor(PREVIOUS, self.object_list[0])
+        return None
+
+    @property
+    def last_cursor(self):
+        return self.paginator.encode_cursor(PREVIOUS)
+
+
+class KeysetPaginator:
+    """Пагинация по ключу сортировки (seek method).
+
+    Курсор хранит направление и значения полей сортировки крайнего
+    объекта страницы, поэтому любая страница выбирается одним запросом
+    с условием по индексу, независимо от её «глубины».
+    """
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        opts = object_list.model._meta
+        self._fields = [
+            (opts.get_field(name.lstrip('-')), name.startswith('-'))
+            for name in self.ordering
+        ]
+
+    def encode_cursor(self, direction, obj=None):
+        values = None
+        if obj is not None:
+            values = [
+                field.value_to_string(obj) for field, _ in self._fields
+            ]
+        payload = json.dumps([direction, values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(
+            payload.encode()
+        ).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Возвращает (направление, значения) или None для битого курсора."""
+        if not cursor:
+            return None
+        try:
+            payload = base64.urlsafe_b64decode(
+                cursor + '=' * (-len(cursor) % 4)
+            )
+            direction, values = json.loads(payload)
+            if direction not in (NEXT, PREVIOUS):
+                return None
+            if values is not None:
+                if len(values) != len(self._fields):
+                    return None
+                values = [
+                    field.to_python(value)
+                    for (field, _), value in zip(self._fields, values)
+                ]
+        except (binascii.Error, ValueError, TypeError, ValidationError):
+            return None
+        return direction, values
+
+    def _seek_filter(self, values, forward):
+        condition = Q()
+        for index, (field, descending) in enumerate(self._fields):
+            lookup = 'lt' if descending == forward else 'gt'
+            step = Q(**{f'{field.name}__{lookup}': values[index]})
+            for (prev_field, _), value in zip(self._fields[:index], values):
+                step &= Q(**{prev_field.name: value})
+            condition |= step
+        return condition
+
+    def _reversed_ordering(self):
+        return tuple(
+            name[1:] if name.startswith('-') else f'-{name}'
+            for name in self.ordering
+        )
+
+    def get_page(self, cursor=None):
+        decoded = self.decode_cursor(cursor)
+        direction, values = decoded or (NEXT, None)
+        forward = direction == NEXT
+        queryset = self.object_list.order_by(
+            *(self.ordering if forward else self._reversed_ordering())
+        )
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(values, forward))
+        items = list(queryset[:self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+        if forward:
+            return KeysetPage(items, self, has_more, values is not None)
+        items.reverse()
+        return KeysetPage(items, self, values is not None, has_more)
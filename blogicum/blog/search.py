@@ -0,0 +1,97 @@
+import re
+
+from django.db import connections
+from django.db.models import F, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Post
+
+SEARCH_CONFIG = 'russian'
+FTS_TABLE = 'blog_post_fts'
+MIN_STEM_LENGTH = 3
+
+WORD = re.compile(r'\w+')
+CYRILLIC = re.compile(r'^[а-я]+$')
+REFLEXIVE_ENDINGS = ('ся', 'сь')
+ENDINGS = sorted((
+    # Прилагательные и причастия.
+    'ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем',
+    'им', 'ым', 'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю',
+    'ая', 'яя', 'ою', 'ею', 'ивш', 'ывш', 'ующ',
+    # Глаголы.
+    'ла', 'на', 'ете', 'йте', 'ли', 'ло', 'но', 'ет', 'ют', 'ны', 'ть',
+    'ешь', 'ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ил',
+    'ыл', 'ен', 'ило', 'ыло', 'ено', 'ят', 'ует', 'уют', 'ит', 'ыт', 'ены',
+    'ить', 'ыть', 'ишь',
+    # Существительные.
+    'а', 'ев', 'ов', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и',
+    'ией', 'й', 'иям', 'ям', 'ием', 'ам', 'о', 'у', 'ах', 'иях', 'ях',
+    'ы', 'ь', 'ию', 'ью', 'ю', 'ия', 'ья', 'я',
+), key=len, reverse=True)
+
+
+def stem(word):
+    """Упрощённая основа русского слова: отбрасывает одно окончание.
+
+    Основа ищется как префикс, поэтому она находит все формы слова
+    в индексе FTS5, у которого нет русского стеммера.
+    """
+    word = word.lower().replace('ё', 'е')
+    if not CYRILLIC.match(word):
+        return word
+    for endings in (REFLEXIVE_ENDINGS, ENDINGS):
+        for ending in endings:
+            if (
+                word.endswith(ending)
+                and len(word) - len(ending) >= MIN_STEM_LENGTH
+            ):
+                word = word[:-len(ending)]
+                break
+    return word
+
+
+def search_vector():
+    """Выражение tsvector; совпадает с выражением индекса post_search_idx."""
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector('title', 'text', config=SEARCH_CONFIG)
+
+
+def fts_query(query):
+    """Запрос FTS5: все слова запроса как префиксы их основ."""
+    return ' '.join(f'"{stem(word)}"*' for word in WORD.findall(query))
+
+
+def search_posts(posts, query):
+    """Публикации, найденные по запросу, от более релевантных к менее.
+
+    PostgreSQL ищет по tsvector с русской морфологией (GIN-индекс
+    post_search_idx), SQLite — по таблице FTS5 blog_post_fts.
+    """
+    vendor = connections[posts.db].vendor
+    if not WORD.search(query):
+        return posts.none()
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        search_query = SearchQuery(
+            query, config=SEARCH_CONFIG, search_type='websearch'
+        )
+        posts = posts.annotate(search=search_vector()).filter(
+            search=search_query
+        ).annotate(rank=SearchRank(F('search'), search_query))
+    elif vendor == 'sqlite':
+        match = fts_query(query)
+        table = connections[posts.db].ops.quote_name(Post._meta.db_table)
+        posts = posts.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,)
+        )).annotate(rank=RawSQL(
+            f'SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE}'
+            f' WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id',
+            (match,)
+        ))
+    else:
+        condition = Q()
+        for word in WORD.findall(query):
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        posts = posts.filter(condition).annotate(rank=Value(0))
+    return posts.order_by('-rank', '-pub_date')
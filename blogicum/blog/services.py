@@ -1,25 +1,148 @@
+from functools import partial
+
 from django.core.paginator import Paginator
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
 from django.utils.timezone import now
 
-from .constants import POSTS_PER_PAGE
+from .cache import (
+    bump_feed_versions, category_feed, get_feed_count, post_feed, post_feeds
+)
+from .clock import publication_clock
+from .constants import BULK_BATCH_SIZE, COMMENTS_PER_PAGE, POSTS_PER_PAGE
+from .models import Comment, Post
+from .pagination import CachedCountPaginator, KeysetPaginator
+from .thumbnails import release_image
 
 
 def common_filter(model_objects):
     return model_objects.filter(
-        pub_date__lt=(now()), is_published=True, category__is_published=True
+        pub_date__lt=publication_clock(),
+        is_published=True,
+        category__is_published=True
+    )
+
+
+def is_visible(post):
+    """То же условие, что в common_filter, для уже загруженного поста."""
+    return (
+        post.is_published
+        and post.category is not None
+        and post.category.is_published
+        and post.pub_date < publication_clock()
     )
 
 
-def get_paginator(post_list, page):
-    paginator = Paginator(post_list, POSTS_PER_PAGE)
+def get_paginator(post_list, query_params, keyset=False, feed=None):
+    """Страница ленты по параметрам запроса.
+
+    В режиме keyset страница выбирается по курсору ``?cursor=``;
+    старые ссылки вида ``?page=N`` продолжают обслуживаться
+    обычным постраничным пагинатором. Если задана лента feed,
+    общее число публикаций берётся из кеша.
+    """
+    page = query_params.get('page')
+    cursor = query_params.get('cursor')
+    if keyset and (cursor or not page):
+        return KeysetPaginator(post_list, POSTS_PER_PAGE).get_page(cursor)
+    if feed is None:
+        paginator = Paginator(post_list, POSTS_PER_PAGE)
+    else:
+        paginator = CachedCountPaginator(
+            post_list, POSTS_PER_PAGE, partial(get_feed_count, feed)
+        )
     page_obj = paginator.get_page(page)
     return page_obj
 
 
+def get_comments_page(post, cursor=None):
+    """Очередная порция комментариев к посту, по курсору (created_at, id)."""
+    return KeysetPaginator(
+        post.comments.select_related('author'),
+        COMMENTS_PER_PAGE,
+        ordering=('created_at', 'id')
+    ).get_page(cursor)
+
+
 def comment_counter(posts):
     return posts.select_related(
         'category', 'location', 'author'
-    ).annotate(comment_count=Count(
-        'comments'
-    )).order_by('-pub_date')
+    ).order_by('-pub_date')
+
+
+def change_comment_count(post_id, delta):
+    """Сдвигает счётчик; расхождение не даёт ему уйти ниже нуля."""
+    Post.objects.filter(pk=post_id).update(
+        comment_count=Greatest(F('comment_count') + delta, 0)
+    )
+
+
+def reconcile_comment_counts(posts=None):
+    """Пересчитывает comment_count, возвращает число исправленных постов."""
+    posts = Post.objects.all() if posts is None else posts
+    actual = Comment.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(total=Count('pk')).values('total')
+    return posts.annotate(
+        actual_count=Coalesce(Subquery(actual), 0)
+    ).exclude(comment_count=F('actual_count')).update(
+        comment_count=Coalesce(Subquery(actual), 0)
+    )
+
+
+def id_batches(posts):
+    ids = list(posts.order_by().values_list('id', flat=True))
+    for start in range(0, len(ids), BULK_BATCH_SIZE):
+        yield ids[start:start + BULK_BATCH_SIZE]
+
+
+def affected_feeds(posts):
+    feeds = set()
+    for post_id, *post in posts.order_by().values_list(
+        'id', 'author__username', 'category__slug'
+    ):
+        feeds.add(post_feed(post_id))
+        feeds.update(post_feeds(*post))
+    return feeds
+
+
+def bulk_update_posts(posts, **fields):
+    """Обновляет публикации пачками UPDATE без save() и сигналов.
+
+    Ленты, где публикации были и куда попадут, сбрасываются один раз.
+    Возвращает число изменённых публикаций.
+    """
+    feeds = affected_feeds(posts)
+    if fields.get('category') is not None:
+        feeds.add(category_feed(fields['category'].slug))
+    updated = 0
+    for batch in id_batches(posts):
+        updated += Post.objects.filter(id__in=batch).update(
+            updated_at=now(), **fields
+        )
+    bump_feed_versions(*feeds)
+    return updated
+
+
+def bulk_delete_posts(posts):
+    """Удаляет публикации вместе с комментариями пачками DELETE.
+
+    Возвращает число удалённых публикаций и комментариев.
+    """
+    feeds = affected_feeds(posts)
+    deleted_posts = deleted_comments = 0
+    for batch in id_batches(posts):
+        batch_posts = Post.objects.filter(id__in=batch)
+        with transaction.atomic(using=batch_posts.db):
+            images = set(
+                batch_posts.exclude(image='').values_list('image', flat=True)
+            )
+            deleted_comments += Comment.objects.filter(
+                post_id__in=batch
+            )._raw_delete(batch_posts.db)
+            deleted_posts += batch_posts._raw_delete(batch_posts.db)
+            for name in images:
+                release_image(name)
+    bump_feed_versions(*feeds)
+    return deleted_posts, deleted_comments
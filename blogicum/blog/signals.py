@@ -0,0 +1,136 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import (
+    ALL_FEEDS, author_feed, bump_feed_versions, post_feed, post_feeds,
+    schedule_publication
+)
+from .models import Category, Comment, Location, Post, User
+from .services import change_comment_count
+from .thumbnails import release_image, release_image_claim
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_state(sender, instance, raw, **kwargs):
+    instance._previous_category_slug = instance._previous_image = None
+    if not raw and instance.pk is not None:
+        previous = Post.objects.filter(pk=instance.pk).values_list(
+            'category__slug', 'image'
+        ).first()
+        if previous is not None:
+            (
+                instance._previous_category_slug, instance._previous_image
+            ) = previous
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_feeds(sender, instance, **kwargs):
+    bump_feed_versions(post_feed(instance.pk), *post_feeds(
+        instance.author.username,
+        instance.category.slug if instance.category_id else None,
+        getattr(instance, '_previous_category_slug', None),
+    ))
+
+
+@receiver(post_save, sender=Post)
+def remember_scheduled_publication(sender, instance, **kwargs):
+    schedule_publication(instance.pub_date)
+
+
+@receiver(post_save, sender=Post)
+def release_replaced_image(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_image', None)
+    if previous and previous != instance.image.name:
+        release_image(previous)
+
+
+@receiver(post_save, sender=Post)
+def release_saved_image_claim(sender, instance, **kwargs):
+    release_image_claim(instance)
+
+
+@receiver(post_delete, sender=Post)
+def release_deleted_image(sender, instance, **kwargs):
+    release_image(instance.image.name)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_all_feeds(sender, instance, **kwargs):
+    bump_feed_versions(ALL_FEEDS)
+
+
+@receiver(pre_save, sender=Comment)
+def remember_previous_comment_post(sender, instance, raw, **kwargs):
+    instance._previous_post_id = None
+    if not raw and instance.pk is not None:
+        instance._previous_post_id = Comment.objects.filter(
+            pk=instance.pk
+        ).values_list('post_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        change_comment_count(instance.post_id, 1)
+        return
+    previous = getattr(instance, '_previous_post_id', None)
+    if previous is not None and previous != instance.post_id:
+        change_comment_count(previous, -1)
+        change_comment_count(instance.post_id, 1)
+        post = Post.objects.filter(pk=previous).values_list(
+            'author__username', 'category__slug'
+        ).first()
+        if post is not None:
+            bump_feed_versions(post_feed(previous), *post_feeds(*post))
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_feeds(sender, instance, **kwargs):
+    post = Post.objects.filter(pk=instance.post_id).values_list(
+        'author__username', 'category__slug'
+    ).first()
+    if post is not None:
+        bump_feed_versions(post_feed(instance.post_id), *post_feeds(*post))
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(sender, instance, raw, update_fields,
+                               **kwargs):
+    instance._previous_username = None
+    if (
+        not raw and instance.pk is not None
+        and (update_fields is None or 'username' in update_fields)
+    ):
+        instance._previous_username = User.objects.filter(
+            pk=instance.pk
+        ).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_feeds(sender, instance, **kwargs):
+    """Имя автора есть в карточках, комментариях и на страницах постов.
+
+    После смены имени сбрасываются все ленты, иначе страницы
+    со старым именем ссылались бы на несуществующий профиль.
+    """
+    previous = getattr(instance, '_previous_username', None)
+    if previous is not None and previous != instance.username:
+        bump_feed_versions(
+            ALL_FEEDS, author_feed(previous), author_feed(previous, True)
+        )
+        return
+    bump_feed_versions(
+        author_feed(instance.username), author_feed(instance.username, True)
+    )
@@ -0,0 +1,74 @@
+import hashlib
+import os
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+
+from core.caching import cache_lock
+
+IMAGE_LOCK_KEY = 'blog:image:{}'
+IMAGE_CLAIM_KEY = 'blog:image-claim:{}'
+IMAGE_CLAIM_TIMEOUT = 10 * 60
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит файлы под именем, равным SHA-256 их содержимого.
+
+    Повторная загрузка того же файла не создаёт копию, а возвращает
+    имя уже сохранённого. Удалением файлов, на которые больше не
+    ссылаются посты, занимаются сигналы и команда collect_orphan_images.
+
+    Сохранение «занимает» имя до фиксации поста, который на него
+    ссылается (release_claim), а delete_unreferenced проверяет это
+    под той же блокировкой. Так удаление не заберёт файл, который
+    дедупликация только что отдала новой загрузке.
+    """
+
+    def content_name(self, name, content):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        return os.path.join(
+            directory, digest[:2], digest[2:4], f'{digest}{extension}'
+        ).replace('\\', '/')
+
+    def _save(self, name, content):
+        name = self.content_name(name, content)
+        with cache_lock(cache, IMAGE_LOCK_KEY.format(name)):
+            cache.set(IMAGE_CLAIM_KEY.format(name), 1, IMAGE_CLAIM_TIMEOUT)
+            if self.exists(name):
+                return name
+        temporary = super()._save(f'{name}.{uuid4().hex}.tmp', content)
+        os.replace(self.path(temporary), self.path(name))
+        return name
+
+    def save_derivative(self, name, content):
+        """Сохраняет производный файл (миниатюру) под заданным именем."""
+        temporary = super()._save(f'{name}.{uuid4().hex}.tmp', content)
+        os.replace(self.path(temporary), self.path(name))
+        return name
+
+    def release_claim(self, name):
+        """Снимает отметку загрузки: ссылка на файл уже в базе."""
+        cache.delete(IMAGE_CLAIM_KEY.format(name))
+
+    def delete_unreferenced(self, name, is_referenced, derivatives=()):
+        """Удаляет файл и производные от него, если он не используется.
+
+        Возвращает False, если на файл ссылаются или его загружают.
+        """
+        with cache_lock(cache, IMAGE_LOCK_KEY.format(name)):
+            if (
+                cache.get(IMAGE_CLAIM_KEY.format(name)) is not None
+                or is_referenced(name)
+            ):
+                return False
+            for target in (name, *derivatives):
+                self.delete(target)
+        return True
@@ -0,0 +1,22 @@
+from django import template
+
+from blog.constants import THUMBNAIL_WIDTHS
+from blog.thumbnails import variant_name
+
+register = template.Library()
+
+
+@register.filter
+def srcset(image, extension):
+    """Атрибут srcset из готовых миниатюр изображения в формате extension."""
+    if not image:
+        return ''
+    storage = image.storage
+    return ', '.join(
+        f'{storage.url(name)} {width}w'
+        for width, name in (
+            (width, variant_name(image.name, width, extension))
+            for width in THUMBNAIL_WIDTHS
+        )
+        if storage.exists(name)
+    )
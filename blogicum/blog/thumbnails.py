@@ -0,0 +1,158 @@
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.utils.timezone import now
+from PIL import Image
+
+from .cache import bump_feed_versions, post_feed, post_feeds
+from .constants import THUMBNAIL_QUALITY, THUMBNAIL_WIDTHS
+from .models import Post
+
+logger = logging.getLogger('blog.thumbnails')
+
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', {'quality': THUMBNAIL_QUALITY, 'method': 4}),
+    'jpg': (
+        'JPEG',
+        {'quality': THUMBNAIL_QUALITY, 'progressive': True, 'optimize': True}
+    ),
+}
+
+VARIANT_PATTERN = re.compile(
+    r'^(?P<base>.+)\.\d+w\.(?:' + '|'.join(THUMBNAIL_FORMATS) + r')$'
+)
+
+_executor = None
+
+
+def image_storage():
+    return Post._meta.get_field('image').storage
+
+
+def variant_name(name, width, extension):
+    """Имя уменьшенной копии: рядом с оригиналом, с шириной в имени."""
+    base, _ = os.path.splitext(name)
+    return f'{base}.{width}w.{extension}'
+
+
+def original_base(name):
+    """Имя оригинала без расширения для миниатюры, иначе None."""
+    match = VARIANT_PATTERN.match(name)
+    return match.group('base') if match else None
+
+
+def variant_names(name):
+    return [
+        variant_name(name, width, extension)
+        for width in THUMBNAIL_WIDTHS
+        for extension in THUMBNAIL_FORMATS
+    ]
+
+
+def generate_thumbnails(name):
+    """Создаёт недостающие уменьшенные копии изображения.
+
+    Габариты берутся из заголовка: если все копии уже есть, оригинал
+    не декодируется, а кеши постов не сбрасываются.
+    """
+    storage = image_storage()
+    with storage.open(name) as original:
+        image = Image.open(original)
+        missing = [
+            (width, extension)
+            for width in THUMBNAIL_WIDTHS if width < image.width
+            for extension in THUMBNAIL_FORMATS
+            if not storage.exists(variant_name(name, width, extension))
+        ]
+        if not missing:
+            return
+        image.load()
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    for width in sorted({width for width, _ in missing}):
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for extension in THUMBNAIL_FORMATS:
+            if (width, extension) not in missing:
+                continue
+            image_format, options = THUMBNAIL_FORMATS[extension]
+            buffer = BytesIO()
+            resized.save(buffer, image_format, **options)
+            save = getattr(storage, 'save_derivative', storage.save)
+            save(
+                variant_name(name, width, extension),
+                ContentFile(buffer.getvalue())
+            )
+    posts = Post.objects.filter(image=name)
+    feeds = set()
+    for post_id, *post in posts.values_list(
+        'id', 'author__username', 'category__slug'
+    ):
+        feeds.add(post_feed(post_id))
+        feeds.update(post_feeds(*post))
+    posts.update(updated_at=now())
+    bump_feed_versions(*feeds)
+
+
+def _generate_safely(name):
+    try:
+        generate_thumbnails(name)
+    except Exception:
+        logger.exception('Не удалось создать миниатюры для %s', name)
+
+
+def _generate_in_worker(name):
+    try:
+        _generate_safely(name)
+    finally:
+        connections.close_all()
+
+
+def submit(name):
+    global _executor
+    if not settings.THUMBNAIL_WORKERS:
+        _generate_safely(name)
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.THUMBNAIL_WORKERS,
+            thread_name_prefix='thumbnails'
+        )
+    _executor.submit(_generate_in_worker, name)
+
+
+def schedule_thumbnails(post):
+    """Ставит создание миниатюр в очередь после фиксации транзакции."""
+    if post.image:
+        name = post.image.name
+        transaction.on_commit(lambda: submit(name))
+
+
+def is_referenced(name):
+    return Post.objects.filter(image=name).exists()
+
+
+def delete_image(name):
+    """Удаляет изображение и его миниатюры, если на него нет ссылок."""
+    if name:
+        image_storage().delete_unreferenced(
+            name, is_referenced, variant_names(name)
+        )
+
+
+def release_image_claim(post):
+    """После фиксации поста его изображение защищает ссылка в базе."""
+    if post.image:
+        name = post.image.name
+        transaction.on_commit(lambda: image_storage().release_claim(name))
+
+
+def release_image(name):
+    if name:
+        transaction.on_commit(lambda: delete_image(name))
@@ -0,0 +1,27 @@
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+from .constants import MAX_IMAGE_UPLOAD_SIZE
+
+
+class BoundedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """Пишет загрузку во временный файл, но не больше MAX_IMAGE_UPLOAD_SIZE.
+
+    Превысивший лимит файл обрезается, а остаток потока только
+    подсчитывается: форма видит настоящий размер и отклоняет файл,
+    не читая его содержимое.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.too_large = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.too_large:
+            return None
+        if start + len(raw_data) > MAX_IMAGE_UPLOAD_SIZE:
+            self.too_large = True
+            self.file.seek(0)
+            self.file.truncate()
+            return None
+        self.file.write(raw_data)
+        return None
@@ -13,6 +13,8 @@ urlpatterns = [
          views.category_posts, name='category_posts'),
     path('profile/<slug:username>/',
          views.profile, name='profile'),
+    path('search/',
+         views.search, name='search'),
     path('profile/edit',
          views.edit_profile, name='edit_profile'),
     path('posts/create/',
@@ -21,6 +23,8 @@ urlpatterns = [
          views.edit_post, name='edit_post'),
     path('posts/<int:post_id>/delete/',
          views.delete_post, name='delete_post'),
+    path('posts/<int:post_id>/comments/',
+         views.post_comments, name='post_comments'),
     path('posts/<int:post_id>/comment/',
          views.add_comment, name='add_comment'),
     path('posts/<int:post_id>/edit_comment/<int:comment_id>/',
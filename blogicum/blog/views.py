@@ -1,50 +1,127 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
+from .cache import (
+    INDEX_FEED, author_feed, cache_anonymous_page, category_feed,
+    conditional_page, post_feed
+)
 from .forms import CommentForm, PostForm, ProfileForm
 from .models import Category, Comment, Post, User
-from .services import comment_counter, common_filter, get_paginator
+from .search import search_posts
+from .services import (
+    comment_counter, common_filter, get_comments_page, get_paginator,
+    is_visible
+)
+from .thumbnails import schedule_thumbnails
 
 
+@conditional_page(lambda: INDEX_FEED)
+@cache_anonymous_page(lambda: INDEX_FEED)
 def index(request):
-    page_obj = get_paginator(common_filter(comment_counter(Post.objects)),
-                             request.GET.get('page'))
+    page_obj = get_paginator(
+        common_filter(comment_counter(Post.objects)),
+        request.GET,
+        keyset='index' in settings.KEYSET_PAGINATION_VIEWS,
+        feed=INDEX_FEED
+    )
     return render(request, 'blog/index.html', {'page_obj': page_obj})
 
 
+def get_visible_post(request, post_id):
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'category', 'location'),
+        pk=post_id
+    )
+    if post.author != request.user and not is_visible(post):
+        raise Http404
+    return post
+
+
+@conditional_page(post_feed)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post.objects, pk=post_id)
+    post = get_visible_post(request, post_id)
     form = CommentForm()
-    if post.author != request.user:
-        post = get_object_or_404(common_filter(Post.objects), pk=post_id)
     return render(request, 'blog/detail.html',
                   {'post': post,
                    'form': form,
-                   'comments': post.comments.all()})
-
-
+                   'comments': get_comments_page(
+                       post, request.GET.get('comments')
+                   )})
+
+
+def post_comments(request, post_id):
+    post = get_visible_post(request, post_id)
+    comments = get_comments_page(post, request.GET.get('cursor'))
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'comments': [
+                {
+                    'id': comment.id,
+                    'author': comment.author.username,
+                    'text': comment.text,
+                    'created_at': comment.created_at.isoformat(),
+                }
+                for comment in comments
+            ],
+            'next_cursor': comments.next_cursor,
+        })
+    return render(request, 'includes/comment_list.html',
+                  {'post': post, 'comments': comments})
+
+
+@conditional_page(category_feed)
+@cache_anonymous_page(category_feed)
 def category_posts(request, category_slug):
     category = get_object_or_404(
         Category,
         slug=category_slug,
         is_published=True
     )
-    page_obj = get_paginator(common_filter(comment_counter(category.posts)),
-                             request.GET.get('page'))
+    page_obj = get_paginator(
+        common_filter(comment_counter(category.posts)),
+        request.GET,
+        keyset='category_posts' in settings.KEYSET_PAGINATION_VIEWS,
+        feed=category_feed(category.slug)
+    )
     return render(request, 'blog/category.html', {'category': category,
                                                   'page_obj': page_obj})
 
 
+@conditional_page(author_feed)
+@cache_anonymous_page(author_feed)
 def profile(request, username):
     profile = get_object_or_404(User, username=username)
     page_obj = comment_counter(profile.posts)
-    if request.user != profile:
+    own = request.user == profile
+    if not own:
         page_obj = common_filter(page_obj)
-    page_obj = get_paginator(page_obj, request.GET.get('page'))
+    page_obj = get_paginator(
+        page_obj,
+        request.GET,
+        keyset='profile' in settings.KEYSET_PAGINATION_VIEWS,
+        feed=author_feed(profile.username, own)
+    )
     return render(request, 'blog/profile.html',
                   {'profile': profile, 'page_obj': page_obj})
 
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    page_obj = get_paginator(
+        search_posts(common_filter(comment_counter(Post.objects)), query),
+        request.GET
+    )
+    return render(request, 'blog/search.html', {
+        'query': query,
+        'page_obj': page_obj,
+        'extra_query': urlencode({'q': query}) + '&',
+    })
+
+
 @login_required
 def edit_profile(request):
     profile = get_object_or_404(User, username=request.user.username)
@@ -63,6 +140,7 @@ def create_post(request):
     post = form.save(commit=False)
     post.author = request.user
     post.save()
+    schedule_thumbnails(post)
     return redirect('blog:profile', request.user.username)
 
 
@@ -73,7 +151,9 @@ def edit_post(request, post_id):
         return redirect('blog:post_detail', post_id=post_id)
     form = PostForm(request.POST, instance=post, files=request.FILES or None)
     if form.is_valid():
-        form.save()
+        post = form.save()
+        if 'image' in form.changed_data:
+            schedule_thumbnails(post)
         return redirect('blog:post_detail', post_id=post_id)
     form = PostForm(instance=post)
     return render(request, 'blog/create.html', {'form': form})
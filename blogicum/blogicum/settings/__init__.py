@@ -0,0 +1,8 @@
+import os
+
+# Профиль настроек выбирается переменной DJANGO_ENV: dev (по умолчанию)
+# или prod.
+if os.environ.get('DJANGO_ENV', 'dev') == 'prod':
+    from .prod import *
+else:
+    from .dev import *
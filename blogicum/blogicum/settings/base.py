@@ -0,0 +1,236 @@
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+SECRET_KEY = os.environ.get(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-jbjr4ztl&^65(2oji=mvt2^k=)*dkpya^-4xi)mu3#fc+nr4wo'
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+]
+
+
+INSTALLED_APPS = [
+    'django_bootstrap5',
+    'blog.apps.BlogConfig',
+    'pages.apps.PagesConfig',
+    'core.apps.CoreConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.RequestStatsMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+
+STATICFILES_DIRS = [
+    BASE_DIR / 'static_dev',
+]
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+# Компилировать все шаблоны при старте WSGI/ASGI-процесса.
+TEMPLATE_WARMUP = False
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+
+# База выбирается переменными окружения DB_*; по умолчанию — SQLite.
+if os.environ.get('DB_ENGINE') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'blogicum'),
+            'USER': os.environ.get('DB_USER', ''),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', ''),
+            'PORT': os.environ.get('DB_PORT', ''),
+            # Соединение переиспользуется запросами потока до истечения срока.
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': (
+                os.environ.get('DB_CONN_HEALTH_CHECKS', '1') == '1'
+            ),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            # timeout — это и busy_timeout: писатель ждёт блокировку 20 с.
+            'OPTIONS': {'timeout': 20},
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        }
+    }
+
+# Именованные кеши: default — версии лент и служебные данные,
+# pages — страницы лент, fragments — фрагменты шаблонов,
+# counts — число публикаций в лентах, sessions — сессии.
+CACHES = {
+    alias: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': alias,
+    }
+    for alias in ('default', 'pages', 'fragments', 'counts', 'sessions')
+}
+
+# Сессии читаются из кеша sessions, в БД — только при промахе.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+SESSION_CACHE_ALIAS = 'sessions'
+
+# ModelBackend остаётся в списке: сессии, созданные до перехода
+# на кеш, хранят его путь и без него разлогинились бы.
+AUTHENTICATION_BACKENDS = [
+    'core.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Режим журнала хранится в файле базы и задаётся один раз на процесс.
+SQLITE_JOURNAL_MODE = 'WAL'
+
+# Настройки соединения SQLite, применяются к каждому новому соединению.
+SQLITE_PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+STATIC_URL = '/static/'
+
+STATIC_ROOT = BASE_DIR / 'static'
+
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+LOGIN_REDIRECT_URL = 'blog:index'
+
+LOGIN_URL = 'login'
+
+CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+MEDIA_ROOT = BASE_DIR / 'media'
+
+MEDIA_URL = '/media/'
+
+# django — файл отдаёт Django (через wsgi.file_wrapper/sendfile);
+# x-accel-redirect (nginx) или x-sendfile (Apache) — веб-сервер.
+MEDIA_SERVE_MODE = 'django'
+
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+MEDIA_CACHE_MAX_AGE = 60 * 60
+
+FILE_UPLOAD_HANDLERS = [
+    'blog.uploadhandlers.BoundedTemporaryFileUploadHandler',
+]
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+# Имена представлений блога, ленты которых листаются курсором
+# (?cursor=...) вместо номера страницы.
+KEYSET_PAGINATION_VIEWS = ()
+
+# Начиная с этого размера ленты число публикаций берётся из оценки
+# планировщика PostgreSQL, а не из COUNT(*). None — всегда точный подсчёт.
+FEED_COUNT_APPROXIMATE_THRESHOLD = None
+
+# То же для пагинации списков публикаций и комментариев в админке.
+ADMIN_COUNT_APPROXIMATE_THRESHOLD = 10_000
+
+# Время жизни (с) кеша страниц лент для анонимных посетителей; 0 — выключен.
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 0
+
+# Шаг (с), с которым движутся часы публикаций в фильтре лент; 0 — точное время.
+PUBLICATION_CLOCK_GRANULARITY = 0
+
+REQUEST_STATS_ENABLED = True
+
+REQUEST_STATS_NAMESPACES = ('blog', 'pages')
+
+REQUEST_STATS_FLUSH_EVERY = 100
+
+REQUEST_STATS_MAX_SAMPLES = 1000
+
+# Кеш для замеров. Команда request_stats читает их из другого процесса,
+# поэтому кеш должен быть общим для процессов (Redis в prod), а не LocMem.
+REQUEST_STATS_CACHE_ALIAS = 'default'
+
+# Сколько последних пачек по REQUEST_STATS_FLUSH_EVERY замеров хранить.
+REQUEST_STATS_MAX_BATCHES = 100
+
+REQUEST_STATS_N_PLUS_ONE_THRESHOLD = 10
+
+# Потоки для создания миниатюр; 0 — создавать сразу в потоке запроса.
+THUMBNAIL_WORKERS = 2
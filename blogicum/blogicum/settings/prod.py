@@ -0,0 +1,38 @@
+from .base import *
+
+SETTINGS_PROFILE = 'prod'
+
+DEBUG = False
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.TextGZipMiddleware',
+    *MIDDLEWARE[1:],
+]
+
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+]
+
+TEMPLATE_WARMUP = True
+
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/0')
+
+CACHES = {
+    alias: {
+        'BACKEND': 'core.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': alias,
+    }
+    for alias in CACHES
+}
+
+REQUEST_STATS_ENABLED = os.environ.get('REQUEST_STATS_ENABLED') == '1'
+
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 60
+
+PUBLICATION_CLOCK_GRANULARITY = 10
@@ -1,8 +1,8 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 
+from core.views import serve_media
 from pages.views import CreateView
 
 handler404 = 'pages.views.page_not_found'
@@ -16,10 +16,16 @@ urlpatterns = [
     path('auth/registration/', CreateView.as_view(), name='registration'),
 ]
 
-if settings.DEBUG:
+if 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
     urlpatterns += [
         path('__debug/', include(debug_toolbar.urls)),
     ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += [
+    re_path(
+        rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.+)$',
+        serve_media,
+        name='media'
+    ),
+]
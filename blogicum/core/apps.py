@@ -4,3 +4,32 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+        from django.contrib.auth import get_user_model
+        from django.core.exceptions import ImproperlyConfigured
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_delete, post_save
+
+        from .auth import forget_user
+        from .checks import debug_overhead
+        from .db import check_connections_health, configure_connection
+
+        if settings.SETTINGS_PROFILE == 'prod':
+            problems = debug_overhead()
+            if problems:
+                raise ImproperlyConfigured(
+                    'Профиль prod запущен с отладочными настройками: '
+                    + ' '.join(problems)
+                )
+
+        connection_created.connect(configure_connection)
+        request_started.connect(check_connections_health)
+        post_save.connect(forget_user, sender=get_user_model())
+        post_delete.connect(forget_user, sender=get_user_model())
+
+        if settings.REQUEST_STATS_ENABLED:
+            from .instrumentation import instrument_templates
+            instrument_templates()
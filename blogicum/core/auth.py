@@ -0,0 +1,32 @@
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+
+from .caching import SESSIONS
+
+USER_KEY = 'core:user:{}'
+USER_CACHE_TIMEOUT = 5 * 60
+
+
+def user_cache():
+    return caches[SESSIONS]
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из кеша.
+
+    Запись удаляется при сохранении или удалении пользователя,
+    в том числе после смены пароля и редактирования профиля.
+    """
+
+    def get_user(self, user_id):
+        key = USER_KEY.format(user_id)
+        user = user_cache().get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                user_cache().set(key, user, USER_CACHE_TIMEOUT)
+        return user
+
+
+def forget_user(sender, instance, **kwargs):
+    user_cache().delete(USER_KEY.format(instance.pk))
@@ -0,0 +1,86 @@
+import math
+import random
+import time
+from contextlib import contextmanager
+
+PAGES = 'pages'
+FRAGMENTS = 'fragments'
+COUNTS = 'counts'
+SESSIONS = 'sessions'
+
+LOCK_KEY = '{}:lock'
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+EARLY_RECOMPUTE_BETA = 1.0
+
+
+def is_fresh(delta, expires, beta=EARLY_RECOMPUTE_BETA):
+    """Вероятностное раннее обновление записи (XFetch).
+
+    Чем ближе срок истечения и чем дольше пересчёт значения delta,
+    тем вероятнее, что запрос сочтёт запись устаревшей и пересчитает
+    её заранее — пока остальные продолжают получать старое значение.
+    """
+    if expires is None:
+        return True
+    return time.time() - delta * beta * math.log(1 - random.random()) < expires
+
+
+def wait_for_entry(cache, key, lock_key, version):
+    """Ждёт, пока держатель блокировки сохранит запись.
+
+    None — блокировка снята без записи или истекло время ожидания.
+    """
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key, version=version)
+        if entry is not None or cache.get(lock_key, version=version) is None:
+            return entry
+    return None
+
+
+@contextmanager
+def cache_lock(cache, key):
+    """Блокировка, общая для процессов с одним кешем.
+
+    Блокировка зависшего процесса снимается через LOCK_TIMEOUT.
+    """
+    lock_key = LOCK_KEY.format(key)
+    while not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        time.sleep(LOCK_POLL_INTERVAL)
+    try:
+        yield
+    finally:
+        cache.delete(lock_key)
+
+
+def get_or_compute(cache, key, compute, timeout, version=None,
+                   cacheable=None):
+    """Значение из кеша или compute() с защитой от лавины пересчётов.
+
+    Пересчитывает значение только процесс, взявший блокировку
+    в том же кеше; остальные ждут результата или получают старое
+    значение. cacheable(value) решает, сохранять ли результат.
+    """
+    lock_key = LOCK_KEY.format(key)
+    entry = cache.get(key, version=version)
+    if entry is not None:
+        value, delta, expires = entry
+        if is_fresh(delta, expires):
+            return value
+        if not cache.add(lock_key, 1, LOCK_TIMEOUT, version=version):
+            return value
+    elif not cache.add(lock_key, 1, LOCK_TIMEOUT, version=version):
+        entry = wait_for_entry(cache, key, lock_key, version)
+        return compute() if entry is None else entry[0]
+    try:
+        started = time.monotonic()
+        value = compute()
+        delta = time.monotonic() - started
+        if cacheable is None or cacheable(value):
+            expires = None if timeout is None else time.time() + timeout
+            cache.set(key, (value, delta, expires), timeout, version=version)
+    finally:
+        cache.delete(lock_key, version=version)
+    return value
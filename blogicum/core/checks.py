@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+CACHED_LOADER = 'django.template.loaders.cached.Loader'
+LOCAL_CACHE_BACKENDS = (DummyCache, LocMemCache)
+
+
+def debug_overhead():
+    """Отладочные настройки, замедляющие каждый запрос."""
+    from django.core.cache import caches
+    from django.template import engines
+    from django.template.backends.django import DjangoTemplates
+
+    problems = []
+    if settings.DEBUG:
+        problems.append('DEBUG = True: все SQL-запросы хранятся в памяти.')
+    if any(app.startswith('debug_toolbar') for app in settings.INSTALLED_APPS):
+        problems.append('debug_toolbar подключён в INSTALLED_APPS.')
+    if any(name.startswith('debug_toolbar') for name in settings.MIDDLEWARE):
+        problems.append('DebugToolbarMiddleware подключён в MIDDLEWARE.')
+    for engine in engines.all():
+        if isinstance(engine, DjangoTemplates) and not any(
+            isinstance(loader, (list, tuple)) and loader[0] == CACHED_LOADER
+            for loader in engine.engine.loaders
+        ):
+            problems.append(
+                f'Шаблоны {engine.name} загружаются без кеширования.'
+            )
+    if isinstance(caches['default'], LOCAL_CACHE_BACKENDS):
+        problems.append('Кеш по умолчанию не общий для процессов.')
+    return problems
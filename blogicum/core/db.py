@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.db import connections
+
+_journal_mode_set = set()
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Применяет SQLITE_PRAGMAS к новому соединению SQLite.
+
+    Режим журнала (WAL: чтение не ждёт записи) хранится в файле базы,
+    поэтому задаётся только первым соединением процесса к этой базе.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        name = connection.settings_dict['NAME']
+        if name not in _journal_mode_set:
+            cursor.execute(
+                f'PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}'
+            )
+            _journal_mode_set.add(name)
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+def check_connections_health(**kwargs):
+    """Закрывает долгоживущие соединения, переставшие отвечать.
+
+    Django 3.2 проверяет соединение только после ошибки в нём;
+    для баз с CONN_HEALTH_CHECKS проверка выполняется перед каждым
+    запросом, и разорванное соединение открывается заново.
+    """
+    for connection in connections.all():
+        if (
+            connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            and connection.connection is not None
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
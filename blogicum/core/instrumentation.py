@@ -0,0 +1,189 @@
+import logging
+import threading
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.backends.django import Template
+
+logger = logging.getLogger('core.request_stats')
+
+STATS_BATCHES_KEY = 'core:request-stats:batches'
+STATS_BATCH_KEY = 'core:request-stats:batch:{}'
+
+METRICS = ('duration_ms', 'queries', 'sql_ms', 'template_ms', 'size')
+
+_current = ContextVar('request_stats', default=None)
+_buffer = defaultdict(list)
+_buffer_lock = threading.Lock()
+_buffered = 0
+
+
+class RequestStats:
+    """Счётчики одного запроса; используется как execute_wrapper."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += perf_counter() - start
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def repeated_statements(self):
+        """Запросы, повторённые не реже порога: признак N+1."""
+        threshold = settings.REQUEST_STATS_N_PLUS_ONE_THRESHOLD
+        return [
+            (sql, count) for sql, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+def start_request():
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+def instrument_templates():
+    """Учитывает время отрисовки шаблонов в статистике запроса."""
+    original = Template.render
+    if getattr(original, 'instrumented', False):
+        return
+
+    @wraps(original)
+    def render(self, *args, **kwargs):
+        stats = _current.get()
+        if stats is None:
+            return original(self, *args, **kwargs)
+        start = perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            stats.template_time += perf_counter() - start
+
+    render.instrumented = True
+    Template.render = render
+
+
+def record(view_name, stats, duration, size):
+    global _buffered
+    repeated = stats.repeated_statements()
+    if repeated:
+        sql, count = repeated[0]
+        logger.warning(
+            'Возможный N+1 в %s: запрос выполнен %s раз: %s',
+            view_name, count, sql
+        )
+    sample = (
+        round(duration * 1000, 3),
+        stats.queries,
+        round(stats.sql_time * 1000, 3),
+        round(stats.template_time * 1000, 3),
+        size,
+        bool(repeated),
+    )
+    with _buffer_lock:
+        _buffer[view_name].append(sample)
+        _buffered += 1
+        if _buffered < settings.REQUEST_STATS_FLUSH_EVERY:
+            return
+        pending = dict(_buffer)
+        _buffer.clear()
+        _buffered = 0
+    flush(pending)
+
+
+def stats_cache():
+    return caches[settings.REQUEST_STATS_CACHE_ALIAS]
+
+
+def flush(pending):
+    """Переносит накопленные замеры процесса в общий кеш.
+
+    Каждая пачка получает свой номер от атомарного incr и пишется
+    в отдельный ключ, поэтому процессы не затирают замеры друг друга.
+    Ключи образуют кольцо из REQUEST_STATS_MAX_BATCHES пачек.
+    """
+    cache = stats_cache()
+    cache.add(STATS_BATCHES_KEY, 0, None)
+    try:
+        number = cache.incr(STATS_BATCHES_KEY)
+    except ValueError:
+        # Статистику очистили между add и incr.
+        return
+    cache.set(
+        STATS_BATCH_KEY.format(number % settings.REQUEST_STATS_MAX_BATCHES),
+        pending,
+        None
+    )
+
+
+def stored_samples():
+    """Последние замеры всех процессов по представлениям."""
+    batches = stats_cache().get_many([
+        STATS_BATCH_KEY.format(index)
+        for index in range(settings.REQUEST_STATS_MAX_BATCHES)
+    ])
+    samples = defaultdict(list)
+    for batch in batches.values():
+        for view_name, view_samples in batch.items():
+            samples[view_name].extend(view_samples)
+    limit = settings.REQUEST_STATS_MAX_SAMPLES
+    return {
+        view_name: view_samples[-limit:]
+        for view_name, view_samples in samples.items()
+    }
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = max(0, -(-len(ordered) * percent // 100) - 1)
+    return ordered[int(index)]
+
+
+def summary():
+    """Перцентили метрик по каждому представлению."""
+    result = {}
+    for view_name, samples in sorted(stored_samples().items()):
+        columns = list(zip(*samples))
+        result[view_name] = {
+            'requests': len(samples),
+            'n_plus_one': sum(columns[len(METRICS)]),
+            **{
+                metric: {
+                    f'p{percent}': percentile(
+                        [value for value in values if value is not None]
+                        or [0],
+                        percent
+                    )
+                    for percent in (50, 95, 99)
+                }
+                for metric, values in zip(METRICS, columns)
+            },
+        }
+    return result
+
+
+def reset():
+    global _buffered
+    with _buffer_lock:
+        _buffer.clear()
+        _buffered = 0
+    stats_cache().delete_many([STATS_BATCHES_KEY] + [
+        STATS_BATCH_KEY.format(index)
+        for index in range(settings.REQUEST_STATS_MAX_BATCHES)
+    ])
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.checks import LOCAL_CACHE_BACKENDS
+from core.instrumentation import METRICS, reset, stats_cache, summary
+
+
+class Command(BaseCommand):
+    help = 'Перцентили времени ответа и числа запросов по представлениям.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Очистить накопленную статистику.'
+        )
+
+    def handle(self, *args, **options):
+        if isinstance(stats_cache(), LOCAL_CACHE_BACKENDS):
+            self.stderr.write(self.style.WARNING(
+                f'Кеш {settings.REQUEST_STATS_CACHE_ALIAS!r} локален для'
+                ' процесса: замеры сервера здесь не видны. Укажите в'
+                ' REQUEST_STATS_CACHE_ALIAS общий кеш, например Redis.'
+            ))
+        if options['reset']:
+            reset()
+            self.stdout.write('Статистика очищена.')
+            return
+        for view_name, data in summary().items():
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{view_name}: запросов {data["requests"]},'
+                f' подозрений на N+1 {data["n_plus_one"]}'
+            ))
+            for metric in METRICS:
+                values = data[metric]
+                self.stdout.write(
+                    f'  {metric:<12} p50={values["p50"]}'
+                    f' p95={values["p95"]} p99={values["p99"]}'
+                )
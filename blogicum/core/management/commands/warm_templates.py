@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.templates import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Компилирует все шаблоны проекта и выводит время по каждому.'
+
+    def handle(self, *args, **options):
+        timings = warm_templates()
+        for name, elapsed in timings:
+            self.stdout.write(f'{elapsed:8.2f} мс  {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Шаблонов: {len(timings)},'
+            f' всего {sum(elapsed for _, elapsed in timings):.2f} мс.'
+        ))
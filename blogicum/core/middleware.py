@@ -0,0 +1,63 @@
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.middleware.gzip import GZipMiddleware
+
+from .instrumentation import finish_request, record, start_request
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript',
+    'application/xml', 'image/svg+xml',
+)
+
+
+class TextGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware только для текстовых ответов.
+
+    Потоковые ответы, частичные ответы 206 и двоичные типы отдаются
+    как есть: Content-Range указывает смещения в несжатом файле,
+    а JPEG и WebP повторное сжатие только замедлит.
+    """
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or response.status_code == 206
+            or not response.get('Content-Type', '').startswith(
+                COMPRESSIBLE_TYPES
+            )
+        ):
+            return response
+        return super().process_response(request, response)
+
+
+class RequestStatsMiddleware:
+    """Собирает время, число SQL-запросов и размер ответа по представлениям.
+
+    Учитываются только представления из пространств имён
+    REQUEST_STATS_NAMESPACES; сводку выводит команда request_stats.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REQUEST_STATS_ENABLED:
+            return self.get_response(request)
+        stats, token = start_request()
+        start = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            finish_request(token)
+        duration = perf_counter() - start
+        match = request.resolver_match
+        if match and match.namespace in settings.REQUEST_STATS_NAMESPACES:
+            size = None if response.streaming else len(response.content)
+            record(match.view_name, stats, duration, size)
+        return response
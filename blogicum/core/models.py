@@ -13,6 +13,15 @@ class CreatedAtModel(models.Model):
         abstract = True
 
 
+class UpdatedAtModel(models.Model):
+    """Абстрактная модель. Добавляет время последнего изменения."""
+
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
 class IsPublishedCreatedAtModel(CreatedAtModel):
     """Абстрактная модель. Добавляет флаг is_published и created_at."""
 
@@ -0,0 +1,256 @@
+import pickle
+import socket
+import threading
+from urllib.parse import unquote, urlparse
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCAN_BATCH_SIZE = 500
+
+
+class RespError(Exception):
+    """Ошибка, которую вернул сервер в ответ на команду."""
+
+
+class RespConnection:
+    """Соединение с сервером, говорящим на протоколе Redis (RESP2)."""
+
+    def __init__(self, host, port, db=0, password=None, timeout=None):
+        self.socket = socket.create_connection((host, port), timeout)
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.socket.makefile('rb')
+        if password:
+            self.execute('AUTH', password)
+        if db:
+            self.execute('SELECT', db)
+
+    @staticmethod
+    def encode(*args):
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode()
+            elif not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        return b''.join(parts)
+
+    def read_reply(self):
+        line = self.reader.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError('Соединение с сервером кеша закрыто.')
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode()
+        if kind == b'-':
+            raise RespError(payload.decode())
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length == -1:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            length = int(payload)
+            if length == -1:
+                return None
+            return [self.read_reply() for _ in range(length)]
+        raise ConnectionError(f'Неизвестный ответ сервера кеша: {line!r}')
+
+    def pipeline(self, *commands):
+        """Отправляет команды одним пакетом и читает все ответы."""
+        self.socket.sendall(b''.join(
+            self.encode(*command) for command in commands
+        ))
+        replies = [self.read_reply_safely() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def read_reply_safely(self):
+        try:
+            return self.read_reply()
+        except RespError as error:
+            return error
+
+    def execute(self, *command):
+        return self.pipeline(command)[0]
+
+    def close(self):
+        self.reader.close()
+        self.socket.close()
+
+
+class RedisCache(BaseCache):
+    """Бэкенд кеша Django для серверов с протоколом Redis.
+
+    LOCATION — адрес вида redis://[:пароль@]хост[:порт][/номер базы].
+    Каждый поток держит своё соединение. Целые числа хранятся как есть,
+    чтобы работал INCRBY, остальные значения сериализуются pickle.
+    """
+
+    def __init__(self, server, params):
+        super().__init__(params)
+        url = urlparse(server)
+        self.address = (url.hostname or '127.0.0.1', url.port or 6379)
+        self.db = int(url.path.strip('/') or 0)
+        self.password = unquote(url.password) if url.password else None
+        self.socket_timeout = params.get('OPTIONS', {}).get(
+            'SOCKET_TIMEOUT', 5
+        )
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = RespConnection(
+                *self.address, db=self.db, password=self.password,
+                timeout=self.socket_timeout
+            )
+            self._local.connection = connection
+        return connection
+
+    def _pipeline(self, *commands):
+        try:
+            return self._connection().pipeline(*commands)
+        except (OSError, ConnectionError):
+            self._disconnect()
+            raise
+
+    def _execute(self, *command):
+        return self._pipeline(command)[0]
+
+    @staticmethod
+    def _dumps(value):
+        if type(value) is int:
+            return str(value).encode()
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _loads(data):
+        if data is None:
+            return None
+        try:
+            return int(data)
+        except ValueError:
+            return pickle.loads(data)
+
+    def _expiry(self, timeout):
+        """Аргументы SET для срока жизни; None — запись устарела сразу."""
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return []
+        milliseconds = int(timeout * 1000)
+        if milliseconds <= 0:
+            return None
+        return ['PX', milliseconds]
+
+    def _key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        expiry = self._expiry(timeout)
+        if expiry is None:
+            return not self._execute('EXISTS', key)
+        return self._execute(
+            'SET', key, self._dumps(value), 'NX', *expiry
+        ) is not None
+
+    def get(self, key, default=None, version=None):
+        value = self._loads(self._execute('GET', self._key(key, version)))
+        return default if value is None else value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        expiry = self._expiry(timeout)
+        if expiry is None:
+            self._execute('DEL', key)
+        else:
+            self._execute('SET', key, self._dumps(value), *expiry)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        expiry = self._expiry(timeout)
+        if expiry is None:
+            return bool(self._execute('DEL', key))
+        if not expiry:
+            _, exists = self._pipeline(('PERSIST', key), ('EXISTS', key))
+            return bool(exists)
+        return bool(self._execute('PEXPIRE', key, expiry[1]))
+
+    def delete(self, key, version=None):
+        return bool(self._execute('DEL', self._key(key, version)))
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self._execute(
+            'MGET', *(self._key(key, version) for key in keys)
+        )
+        return {
+            key: self._loads(value)
+            for key, value in zip(keys, values) if value is not None
+        }
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expiry = self._expiry(timeout)
+        if not data:
+            return []
+        if expiry is None:
+            self.delete_many(data, version=version)
+            return []
+        self._pipeline(*(
+            ('SET', self._key(key, version), self._dumps(value), *expiry)
+            for key, value in data.items()
+        ))
+        return []
+
+    def delete_many(self, keys, version=None):
+        keys = [self._key(key, version) for key in keys]
+        if keys:
+            self._execute('DEL', *keys)
+
+    def has_key(self, key, version=None):
+        return bool(self._execute('EXISTS', self._key(key, version)))
+
+    def incr(self, key, delta=1, version=None):
+        key = self._key(key, version)
+        if not self._execute('EXISTS', key):
+            raise ValueError(f"Key '{key}' not found")
+        return self._execute('INCRBY', key, delta)
+
+    def clear(self):
+        """Удаляет записи этого кеша: по KEY_PREFIX или всю базу."""
+        if not self.key_prefix:
+            self._execute('FLUSHDB')
+            return
+        cursor = b'0'
+        pattern = f'{self.key_prefix}:*'
+        while True:
+            cursor, keys = self._execute(
+                'SCAN', cursor, 'MATCH', pattern, 'COUNT', SCAN_BATCH_SIZE
+            )
+            if keys:
+                self._execute('DEL', *keys)
+            if cursor in (b'0', 0):
+                break
+
+    def close(self, **kwargs):
+        """Соединение потока переиспользуется между запросами."""
+
+    def _disconnect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            self._local.connection = None
+            try:
+                connection.close()
+            except OSError:
+                pass
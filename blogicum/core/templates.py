@@ -0,0 +1,39 @@
+import logging
+from pathlib import Path
+from time import perf_counter
+
+from django.template import TemplateSyntaxError, engines
+
+logger = logging.getLogger('core.templates')
+
+
+def template_names(engine):
+    for directory in engine.dirs:
+        directory = Path(directory)
+        for path in sorted(directory.rglob('*.html')):
+            yield path.relative_to(directory).as_posix()
+
+
+def warm_templates():
+    """Загружает и компилирует все шаблоны из DIRS движка Django.
+
+    С кешируемым загрузчиком шаблоны остаются в памяти процесса,
+    и первые запросы к нему не тратят время на разбор.
+    Возвращает список (имя, время компиляции в мс) по убыванию времени.
+    """
+    engine = engines['django'].engine
+    timings = []
+    for name in template_names(engine):
+        start = perf_counter()
+        try:
+            engine.get_template(name)
+        except TemplateSyntaxError:
+            logger.exception('Не удалось скомпилировать шаблон %s', name)
+            continue
+        timings.append((name, (perf_counter() - start) * 1000))
+    timings.sort(key=lambda timing: timing[1], reverse=True)
+    logger.info(
+        'Скомпилировано шаблонов: %s за %.1f мс',
+        len(timings), sum(elapsed for _, elapsed in timings)
+    )
+    return timings
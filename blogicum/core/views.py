@@ -0,0 +1,130 @@
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse, Http404, HttpResponse, StreamingHttpResponse
+)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+HASHED_NAME = re.compile(r'^(?P<digest>[0-9a-f]{64})\.')
+RANGE = re.compile(r'^bytes=(?P<start>\d*)-(?P<end>\d*)$')
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def parse_range(header, size):
+    """(начало, конец) единственного диапазона Range или None.
+
+    Несколько диапазонов не поддерживаются — тогда отдаётся весь файл.
+    Для неудовлетворимого диапазона возвращается (size, size).
+    """
+    match = RANGE.match(header.replace(' ', ''))
+    if not match or not (match['start'] or match['end']):
+        return None
+    if not match['start']:
+        length = int(match['end'])
+        if not length:
+            return size, size
+        return max(0, size - length), size - 1
+    start = int(match['start'])
+    end = int(match['end']) if match['end'] else size - 1
+    if start >= size or end < start:
+        return size, size
+    return start, min(end, size - 1)
+
+
+def iter_file(path, start, length):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def file_response(request, path, full_path, size, etag):
+    mode = settings.MEDIA_SERVE_MODE
+    content_type = mimetypes.guess_type(full_path)[0]
+    content_type = content_type or 'application/octet-stream'
+    # Имена не в ASCII передаются в %-кодировке: иначе Django кодирует
+    # заголовок по MIME, и веб-сервер не находит файл. nginx и
+    # mod_xsendfile (XSendFileUnescape) раскодируют путь сами.
+    if mode == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX + path
+        )
+        return response
+    if mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = quote(full_path)
+        return response
+    if_range = request.headers.get('If-Range')
+    byte_range = None
+    if 'Range' in request.headers and if_range in (None, etag):
+        byte_range = parse_range(request.headers['Range'], size)
+    if byte_range is None:
+        response = FileResponse(
+            open(full_path, 'rb'), content_type=content_type
+        )
+        response['Content-Length'] = size
+    elif byte_range == (size, size):
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            iter_file(full_path, start, end - start + 1),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def serve_media(request, path):
+    """Отдаёт файл из MEDIA_ROOT с ETag, условными запросами и Range.
+
+    Файлы с именем-хешем содержимого неизменяемы и кешируются навсегда.
+    В режимах x-accel-redirect и x-sendfile передачу файла выполняет
+    веб-сервер перед Django.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        file_stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404
+    hashed = HASHED_NAME.match(os.path.basename(full_path))
+    if hashed:
+        etag = quote_etag(os.path.basename(full_path))
+        cache_control = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        etag = quote_etag(
+            f'{file_stat.st_size:x}-{file_stat.st_mtime_ns:x}'
+        )
+        cache_control = f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+    last_modified = int(file_stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = file_response(
+            request, path, full_path, file_stat.st_size, etag
+        )
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control
+    return response
@@ -0,0 +1,137 @@
+import fnmatch
+import socketserver
+import threading
+import time
+
+import pytest
+
+
+class Store:
+    """Минимальное хранилище с командами Redis, нужными бэкенду кеша."""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+
+    def alive(self, key):
+        expires = self.expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def execute(self, name, *args):
+        with self.lock:
+            return getattr(self, f'cmd_{name.lower()}')(*args)
+
+    def cmd_ping(self):
+        return 'PONG'
+
+    def cmd_select(self, db):
+        return 'OK'
+
+    def cmd_set(self, key, value, *options):
+        options = [option.upper() for option in options]
+        if b'NX' in options and self.alive(key):
+            return None
+        self.data[key] = value
+        self.expires.pop(key, None)
+        if b'PX' in options:
+            milliseconds = int(options[options.index(b'PX') + 1])
+            self.expires[key] = time.monotonic() + milliseconds / 1000
+        return 'OK'
+
+    def cmd_get(self, key):
+        return self.data[key] if self.alive(key) else None
+
+    def cmd_mget(self, *keys):
+        return [self.cmd_get(key) for key in keys]
+
+    def cmd_del(self, *keys):
+        deleted = 0
+        for key in keys:
+            if self.alive(key):
+                del self.data[key]
+                self.expires.pop(key, None)
+                deleted += 1
+        return deleted
+
+    def cmd_exists(self, key):
+        return int(self.alive(key))
+
+    def cmd_incrby(self, key, delta):
+        value = int(self.cmd_get(key) or 0) + int(delta)
+        self.data[key] = str(value).encode()
+        return value
+
+    def cmd_pexpire(self, key, milliseconds):
+        if not self.alive(key):
+            return 0
+        self.expires[key] = time.monotonic() + int(milliseconds) / 1000
+        return 1
+
+    def cmd_persist(self, key):
+        return int(
+            self.alive(key) and self.expires.pop(key, None) is not None
+        )
+
+    def cmd_scan(self, cursor, *options):
+        pattern = options[options.index(b'MATCH') + 1].decode()
+        return [b'0', [
+            key for key in list(self.data)
+            if self.alive(key) and fnmatch.fnmatchcase(key.decode(), pattern)
+        ]]
+
+    def cmd_flushdb(self):
+        self.data.clear()
+        self.expires.clear()
+        return 'OK'
+
+
+def encode(reply):
+    if reply is None:
+        return b'$-1\r\n'
+    if isinstance(reply, str):
+        return f'+{reply}\r\n'.encode()
+    if isinstance(reply, int):
+        return b':%d\r\n' % reply
+    if isinstance(reply, bytes):
+        return b'$%d\r\n%s\r\n' % (len(reply), reply)
+    return b'*%d\r\n' % len(reply) + b''.join(map(encode, reply))
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            header = self.rfile.readline()
+            if not header:
+                return
+            command = []
+            for _ in range(int(header[1:])):
+                length = int(self.rfile.readline()[1:])
+                command.append(self.rfile.read(length + 2)[:-2])
+            try:
+                reply = encode(self.server.store.execute(
+                    command[0].decode(), *command[1:]
+                ))
+            except Exception as error:
+                reply = f'-ERR {error}\r\n'.encode()
+            self.wfile.write(reply)
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+@pytest.fixture
+def resp_server():
+    """Сервер с протоколом Redis в потоке теста; возвращает его адрес."""
+    server = RespServer(('127.0.0.1', 0), RespHandler)
+    server.store = Store()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'redis://127.0.0.1:{}/1'.format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.admin import helpers
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+URL = '/admin/blog/post/'
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    return mixer.cycle(15).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=False, pub_date=timezone.now() - timedelta(days=1)
+    )
+
+
+def run_action(admin_client, action, posts, **data):
+    return admin_client.post(URL, {
+        'action': action,
+        helpers.ACTION_CHECKBOX_NAME: [post.id for post in posts],
+        **data,
+    }, follow=True)
+
+
+def test_publish_is_single_update(admin_client, posts):
+    with CaptureQueriesContext(connection) as context:
+        response = run_action(admin_client, 'publish', posts)
+    updates = [
+        query for query in context.captured_queries
+        if query['sql'].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 1, (
+        'Убедитесь, что публикации обновляются одним запросом UPDATE.'
+    )
+    assert Post.objects.filter(is_published=True).count() == 15
+    assert 'Опубликовано публикаций: 15.' in response.content.decode()
+
+
+def test_publish_resets_feed(admin_client, client, posts):
+    assert not client.get('/').context['page_obj'].object_list
+    run_action(admin_client, 'publish', posts[:3])
+    assert len(client.get('/').context['page_obj']) == 3, (
+        'Убедитесь, что после массовой публикации сбрасывается кеш лент.'
+    )
+
+
+def test_move_to_category(admin_client, posts, another_category):
+    response = run_action(admin_client, 'move_to_category', posts[:4])
+    assert 'form' in response.context
+    response = run_action(
+        admin_client, 'move_to_category', posts[:4],
+        apply='yes', category=another_category.id
+    )
+    assert another_category.posts.count() == 4
+    assert 'публикаций: 4.' in response.content.decode()
+
+
+def test_delete_with_comments(admin_client, mixer, posts):
+    mixer.cycle(5).blend('blog.Comment', post=posts[0])
+    mixer.blend('blog.Comment', post=posts[-1])
+    response = run_action(admin_client, 'delete_with_comments', posts[:10])
+    assert Post.objects.count() == 15
+    response = run_action(
+        admin_client, 'delete_with_comments', posts[:10], apply='yes'
+    )
+    assert Post.objects.count() == 5
+    assert Comment.objects.count() == 1
+    assert (
+        'Удалено публикаций: 10, комментариев: 5.'
+        in response.content.decode()
+    )
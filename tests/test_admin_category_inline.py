@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def category_posts(mixer, user, published_category):
+    return mixer.cycle(45).blend(
+        'blog.Post', author=user, category=published_category
+    )
+
+
+def inline_posts(response):
+    formset = response.context['inline_admin_formsets'][0].formset
+    return [form.instance for form in formset.forms]
+
+
+def test_category_inline_is_paginated(
+        admin_client, published_category, category_posts):
+    url = f'/admin/blog/category/{published_category.id}/change/'
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get(url)
+    assert len(inline_posts(response)) == 20, (
+        'Убедитесь, что на странице категории в админке выводится только'
+        ' одна страница её публикаций.'
+    )
+    assert len(context.captured_queries) < 15
+    assert len(inline_posts(admin_client.get(url, {'posts_page': 3}))) == 5
+    assert 'всего публикаций: 45' in response.content.decode()
+
+
+def test_category_saved_with_paginated_inline(
+        admin_client, published_category, category_posts):
+    url = f'/admin/blog/category/{published_category.id}/change/'
+    response = admin_client.get(url)
+    formset = response.context['inline_admin_formsets'][0].formset
+    data = {
+        'title': 'Новое название',
+        'description': published_category.description,
+        'slug': published_category.slug,
+        'is_published': 'on',
+        f'{formset.prefix}-TOTAL_FORMS': len(formset.forms),
+        f'{formset.prefix}-INITIAL_FORMS': len(formset.forms),
+        f'{formset.prefix}-MIN_NUM_FORMS': 0,
+        f'{formset.prefix}-MAX_NUM_FORMS': 1000,
+    }
+    for index, form in enumerate(formset.forms):
+        data[f'{formset.prefix}-{index}-id'] = form.instance.id
+        data[f'{formset.prefix}-{index}-category'] = published_category.id
+    response = admin_client.post(url, data)
+    assert response.status_code == 302
+    published_category.refresh_from_db()
+    assert published_category.title == 'Новое название'
+    assert published_category.posts.count() == 45
@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    return mixer.cycle(30).blend(
+        'blog.Comment', post=post_with_published_location,
+        text='Очень длинный комментарий. ' * 20
+    )
+
+
+def changelist_queries(admin_client, url, params=None):
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get(url, params or {})
+    assert response.status_code == 200
+    return response, context.captured_queries
+
+
+def test_post_changelist_queries_do_not_grow(
+        mixer, admin_client, user, published_category, published_location):
+    mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location
+    )
+    changelist_queries(admin_client, '/admin/blog/post/')
+    _, few = changelist_queries(admin_client, '/admin/blog/post/')
+    mixer.cycle(20).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location
+    )
+    _, many = changelist_queries(admin_client, '/admin/blog/post/')
+    assert len(many) == len(few), (
+        'Убедитесь, что число запросов списка публикаций в админке не'
+        ' зависит от числа публикаций на странице.'
+    )
+
+
+def test_comment_changelist_truncates_text_in_sql(
+        admin_client, many_comments):
+    response, queries = changelist_queries(
+        admin_client, '/admin/blog/comment/'
+    )
+    result = response.context['cl'].result_list
+    assert len(queries) < 10
+    assert all(
+        len(comment.text_preview) == 50 for comment in result
+    )
+    assert any('SUBSTR' in query['sql'].upper() for query in queries), (
+        'Убедитесь, что текст комментария обрезается в SQL.'
+    )
+    assert 'Очень длинный комментарий. ' * 3 not in response.content.decode()
+
+
+def test_input_filters(admin_client, many_comments, mixer):
+    other = mixer.blend('blog.Comment')
+    post_id = many_comments[0].post_id
+    response, _ = changelist_queries(
+        admin_client, '/admin/blog/comment/', {'post': other.post_id}
+    )
+    assert list(response.context['cl'].result_list) == [other]
+    response, _ = changelist_queries(
+        admin_client, '/admin/blog/post/',
+        {'author': many_comments[0].post.author.username}
+    )
+    assert [post.id for post in response.context['cl'].result_list] == [
+        post_id
+    ]
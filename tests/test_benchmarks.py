@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_seed_and_benchmark(tmp_path):
+    from blog.models import Comment, Post
+
+    call_command(
+        'seed_blog', users=5, posts=30, comments=60, categories=2,
+        locations=2, batch_size=7, stdout=None
+    )
+    assert Post.objects.count() == 30
+    assert Comment.objects.count() == 60
+    assert sum(Post.objects.values_list('comment_count', flat=True)) == 60, (
+        'Убедитесь, что seed_blog заполняет счётчики комментариев.'
+    )
+
+    output = tmp_path / 'bench.json'
+    call_command(
+        'benchmark_views', requests=2, warmup=0, output=str(output),
+        stdout=None
+    )
+    call_command(
+        'benchmark_views', requests=2, warmup=0, compare=str(output),
+        stdout=None
+    )
+    report = json.loads(output.read_text())
+    assert {'index', 'post_detail', 'add_comment'} <= set(report['results'])
+    assert report['results']['index']['p95_ms'] > 0
+
+
+def test_seed_twice_after_deleting_newest_rows():
+    from blog.models import Comment, Post, User
+
+    options = dict(
+        users=3, posts=5, comments=10, categories=1, locations=1,
+        batch_size=4, stdout=None
+    )
+    call_command('seed_blog', **options)
+    Post.objects.order_by('-id').first().delete()
+    User.objects.order_by('-id').first().delete()
+    posts_left = Post.objects.count()
+    comments_left = Comment.objects.count()
+    call_command('seed_blog', **options)
+    assert Post.objects.count() == posts_left + 5, (
+        'Убедитесь, что повторный запуск seed_blog с тем же зерном проходит'
+        ' после удаления последних записей.'
+    )
+    assert Comment.objects.count() == comments_left + 10
@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+
+from core.caching import LOCK_KEY, get_or_compute
+from core.redis import RedisCache
+
+
+@pytest.fixture
+def redis_cache(resp_server):
+    return RedisCache(resp_server, {'KEY_PREFIX': 'test'})
+
+
+def test_redis_backend_roundtrip(redis_cache):
+    redis_cache.set('number', 41)
+    redis_cache.set('data', {'posts': [1, 2]})
+    assert redis_cache.incr('number') == 42
+    assert redis_cache.get('data') == {'posts': [1, 2]}
+    assert not redis_cache.add('data', 'other')
+    assert redis_cache.add('new', 'value')
+    assert redis_cache.get_many(['number', 'new', 'missing']) == {
+        'number': 42, 'new': 'value'
+    }
+    redis_cache.set_many({'a': 1, 'b': 2}, version=2)
+    assert redis_cache.get('a', version=2) == 1
+    assert redis_cache.get('a') is None
+    assert redis_cache.delete('new')
+    with pytest.raises(ValueError):
+        redis_cache.incr('missing')
+
+
+def test_redis_backend_expiry_and_clear(redis_cache, resp_server):
+    redis_cache.set('short', 'value', 0.05)
+    redis_cache.set('forever', 'value', None)
+    other = RedisCache(resp_server, {'KEY_PREFIX': 'other'})
+    other.set('kept', 'value')
+    time.sleep(0.1)
+    assert redis_cache.get('short') is None
+    assert redis_cache.get('forever') == 'value'
+    redis_cache.clear()
+    assert redis_cache.get('forever') is None
+    assert other.get('kept') == 'value', (
+        'Убедитесь, что clear() удаляет только ключи своего KEY_PREFIX.'
+    )
+
+
+def test_get_or_compute_single_computation():
+    cache = caches['counts']
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return 42
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            get_or_compute(cache, 'answer', compute, 60)
+        ))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [42] * 8
+    assert len(calls) == 1, (
+        'Убедитесь, что значение пересчитывает только один поток.'
+    )
+
+
+def test_get_or_compute_serves_stale_while_locked():
+    cache = caches['counts']
+    cache.set('answer', (41, 1.0, time.time() - 1), 60)
+    cache.add(LOCK_KEY.format('answer'), 1, 10)
+    assert get_or_compute(cache, 'answer', lambda: 42, 60) == 41
+    cache.delete(LOCK_KEY.format('answer'))
+    assert get_or_compute(cache, 'answer', lambda: 42, 60) == 42
+
+
+@pytest.mark.django_db
+def test_feeds_use_redis_cache(
+        resp_server, client, post_with_published_location):
+    redis_caches = {
+        alias: {
+            'BACKEND': 'core.redis.RedisCache',
+            'LOCATION': resp_server,
+            'KEY_PREFIX': alias,
+        }
+        for alias in ('default', 'pages', 'fragments', 'counts', 'sessions')
+    }
+    with override_settings(
+            CACHES=redis_caches, ANONYMOUS_PAGE_CACHE_TIMEOUT=60):
+        first = client.get('/')
+        second = client.get('/')
+        assert first.content == second.content
+        assert post_with_published_location.title in second.content.decode()
+        assert isinstance(caches['pages'], RedisCache)
+        post_with_published_location.title = 'Новый заголовок'
+        post_with_published_location.save()
+        assert 'Новый заголовок' in client.get('/').content.decode()
@@ -0,0 +1,57 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+URL = '/pages/about/'
+
+
+def request_queries(client, url=URL):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, context.captured_queries
+
+
+def test_session_and_user_served_from_cache(user_client):
+    request_queries(user_client)
+    response, queries = request_queries(user_client)
+    assert response.context['user'].is_authenticated
+    assert not queries, (
+        'Убедитесь, что сессия и пользователь при повторном запросе'
+        ' берутся из кеша, без запросов к БД.'
+    )
+
+
+def test_profile_edit_invalidates_cached_user(user, user_client):
+    request_queries(user_client)
+    user_client.post('/profile/edit', {
+        'username': user.username,
+        'first_name': 'Новое имя',
+        'last_name': user.last_name,
+        'email': 'new@example.com',
+    })
+    response, _ = request_queries(user_client)
+    assert response.context['user'].first_name == 'Новое имя', (
+        'Убедитесь, что после редактирования профиля пользователь'
+        ' перечитывается из БД.'
+    )
+
+
+def test_password_change_logs_out_other_sessions(user, user_client):
+    request_queries(user_client)
+    user.set_password('new-password-123')
+    user.save()
+    response, _ = request_queries(user_client)
+    assert not response.context['user'].is_authenticated
+
+
+def test_session_with_model_backend_still_authenticates(user, client):
+    client.force_login(
+        user, backend='django.contrib.auth.backends.ModelBackend'
+    )
+    response, _ = request_queries(client)
+    assert response.context['user'] == user, (
+        'Убедитесь, что сессии, созданные с ModelBackend, остаются'
+        ' действительными после перехода на CachedModelBackend.'
+    )
@@ -0,0 +1,81 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/comment/'
+    user_client.post(url, data={'text': 'Первый'})
+    user_client.post(url, data={'text': 'Второй'})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        'Убедитесь, что при добавлении комментария увеличивается счётчик'
+        ' `comment_count` публикации.'
+    )
+
+    comment = post.comments.first()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что при удалении комментария уменьшается счётчик'
+        ' `comment_count` публикации.'
+    )
+
+
+def test_reconcile_comment_counts(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=10)
+    call_command('reconcile_comment_counts')
+    post.refresh_from_db()
+    assert post.comment_count == 3
+
+
+def test_post_delete_does_not_touch_comments_one_by_one(
+        mixer, user, published_category, published_location):
+    posts = mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location
+    )
+    mixer.blend('blog.Comment', post=posts[0])
+    mixer.cycle(50).blend('blog.Comment', post=posts[1])
+    query_counts = []
+    for post in posts:
+        post = type(post).objects.get(pk=post.pk)
+        with CaptureQueriesContext(connection) as context:
+            _, deleted = post.delete()
+        query_counts.append(len(context.captured_queries))
+    assert deleted['blog.Comment'] == 50
+    assert query_counts[0] == query_counts[1], (
+        'Убедитесь, что число запросов при удалении публикации не зависит'
+        ' от числа её комментариев.'
+    )
+
+
+def test_moved_comment_updates_both_counts(
+        mixer, user, published_category, published_location):
+    source, target = mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location
+    )
+    comment = mixer.blend('blog.Comment', post=source)
+    comment.post = target
+    comment.save()
+    source.refresh_from_db()
+    target.refresh_from_db()
+    assert (source.comment_count, target.comment_count) == (0, 1), (
+        'Убедитесь, что перенос комментария в другой пост обновляет'
+        ' счётчики обоих постов.'
+    )
+
+    type(target).objects.filter(pk=target.pk).update(comment_count=0)
+    comment.delete()
+    target.refresh_from_db()
+    assert target.comment_count == 0, (
+        'Убедитесь, что расхождение счётчика не уводит его ниже нуля.'
+    )
@@ -0,0 +1,44 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_batches(
+        monkeypatch, mixer, user_client, post_with_published_location):
+    from blog import services
+
+    monkeypatch.setattr(services, 'COMMENTS_PER_PAGE', 2)
+    post = post_with_published_location
+    comments = mixer.cycle(5).blend('blog.Comment', post=post)
+
+    first_batch = user_client.get(f'/posts/{post.id}/').context['comments']
+    assert list(first_batch) == comments[:2], (
+        'Убедитесь, что на странице публикации отображается только первая'
+        ' порция комментариев.'
+    )
+    assert first_batch.has_next()
+
+    response = user_client.get(
+        f'/posts/{post.id}/comments/', {'cursor': first_batch.next_cursor}
+    )
+    assert response.status_code == 200
+    assert list(response.context['comments']) == comments[2:4], (
+        'Убедитесь, что по курсору отдаётся следующая порция комментариев.'
+    )
+
+    response = user_client.get(
+        f'/posts/{post.id}/comments/',
+        {'cursor': response.context['comments'].next_cursor, 'format': 'json'}
+    )
+    data = response.json()
+    assert [item['id'] for item in data['comments']] == [comments[4].id]
+    assert data['next_cursor'] is None
+
+
+def test_comment_batches_hidden_post(
+        unlogged_client, mixer, posts_with_unpublished_category):
+    post = posts_with_unpublished_category[0]
+    response = unlogged_client.get(f'/posts/{post.id}/comments/')
+    assert response.status_code == 404, (
+        'Убедитесь, что комментарии к скрытой публикации недоступны.'
+    )
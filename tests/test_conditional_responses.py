@@ -0,0 +1,112 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def revalidate(client, url, response):
+    with CaptureQueriesContext(connection) as context:
+        repeated = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    return repeated, context.captured_queries
+
+
+@pytest.mark.parametrize('url_template', (
+    '/',
+    '/category/{post.category.slug}/',
+    '/profile/{post.author.username}/',
+    '/posts/{post.id}/',
+))
+def test_unchanged_page_not_modified(
+        client, post_with_published_location, url_template):
+    url = url_template.format(post=post_with_published_location)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.has_header('ETag')
+    assert response.has_header('Last-Modified')
+    repeated, queries = revalidate(client, url, response)
+    assert repeated.status_code == 304, (
+        'Убедитесь, что неизменившаяся страница отдаётся с кодом 304.'
+    )
+    assert not queries, (
+        'Убедитесь, что ETag вычисляется без запросов ленты к БД.'
+    )
+
+
+def test_new_comment_changes_etag(
+        mixer, client, post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/'
+    response = client.get(url)
+    mixer.blend('blog.Comment', post=post_with_published_location)
+    repeated, _ = revalidate(client, url, response)
+    assert repeated.status_code == 200, (
+        'Убедитесь, что новый комментарий меняет ETag страницы публикации.'
+    )
+
+
+def test_edited_post_changes_feed_etag(
+        client, post_with_published_location):
+    response = client.get('/')
+    post_with_published_location.title = 'Новый заголовок'
+    post_with_published_location.save()
+    repeated, _ = revalidate(client, '/', response)
+    assert repeated.status_code == 200
+    assert 'Новый заголовок' in repeated.content.decode()
+
+
+def test_etag_depends_on_user(
+        client, user_client, post_with_published_location):
+    response = client.get('/')
+    assert user_client.get('/')['ETag'] != response['ETag'], (
+        'Убедитесь, что разные пользователи получают разные ETag.'
+    )
+
+
+def test_last_modified_not_shared_between_users(
+        client, user, post_with_published_location):
+    response = client.get('/')
+    client.force_login(user)
+    repeated = client.get(
+        '/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    )
+    assert repeated.status_code == 200, (
+        'Убедитесь, что вошедший пользователь не получает 304 по'
+        ' If-Modified-Since для страницы, отрисованной анонимно.'
+    )
+    assert not repeated.has_header('Last-Modified')
+    assert repeated.has_header('ETag')
+
+
+def test_relogin_changes_etag(user, post_with_published_location):
+    from django.test import Client
+
+    user.set_password('password')
+    user.save()
+    client = Client(enforce_csrf_checks=True)
+
+    def login():
+        client.get('/auth/login/')
+        response = client.post('/auth/login/', {
+            'username': user.username,
+            'password': 'password',
+            'csrfmiddlewaretoken': client.cookies['csrftoken'].value,
+        })
+        assert response.status_code == 302
+
+    url = f'/posts/{post_with_published_location.id}/'
+    login()
+    response = client.get(url)
+    client.post('/auth/logout/', {
+        'csrfmiddlewaretoken': client.cookies['csrftoken'].value,
+    })
+    login()
+    repeated, _ = revalidate(client, url, response)
+    assert repeated.status_code == 200, (
+        'Убедитесь, что после повторного входа страница с формой'
+        ' не отдаётся из кеша браузера со старым CSRF-токеном.'
+    )
+    comment = client.post(f'{url}comment/', {
+        'text': 'Комментарий',
+        'csrfmiddlewaretoken': repeated.context['csrf_token'],
+    })
+    assert comment.status_code == 302
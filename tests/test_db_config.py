@@ -0,0 +1,54 @@
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.db import connection
+
+from core import db
+from core.db import check_connections_health
+
+pytestmark = [pytest.mark.django_db]
+
+
+def pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+def test_sqlite_pragmas_applied():
+    assert pragma('synchronous') == 1, (
+        'Убедитесь, что для SQLite включается synchronous=NORMAL.'
+    )
+    assert pragma('busy_timeout') == 20_000
+    assert pragma('temp_store') == 2
+
+
+def test_sqlite_connections_persist():
+    assert settings.DATABASES['default']['CONN_MAX_AGE'] > 0, (
+        'Убедитесь, что соединение SQLite переиспользуется между запросами.'
+    )
+
+
+def test_journal_mode_set_once(monkeypatch):
+    monkeypatch.setattr(db, '_journal_mode_set', set())
+    fake = mock.MagicMock(vendor='sqlite', settings_dict={'NAME': 'test'})
+    cursor = fake.cursor.return_value.__enter__.return_value
+    db.configure_connection(None, fake)
+    db.configure_connection(None, fake)
+    statements = [call.args[0] for call in cursor.execute.call_args_list]
+    assert sum('journal_mode' in sql for sql in statements) == 1, (
+        'Убедитесь, что режим журнала задаётся один раз на базу.'
+    )
+    assert len(statements) == 1 + 2 * len(settings.SQLITE_PRAGMAS)
+
+
+def test_unusable_connection_closed():
+    connection.ensure_connection()
+    settings_dict = {**connection.settings_dict, 'CONN_HEALTH_CHECKS': True}
+    with mock.patch.object(connection, 'settings_dict', settings_dict), \
+            mock.patch.object(connection, 'in_atomic_block', False), \
+            mock.patch.object(connection, 'is_usable', return_value=False), \
+            mock.patch.object(connection, 'close') as close:
+        check_connections_health()
+    close.assert_called_once()
@@ -0,0 +1,38 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT COUNT(')
+    ]
+
+
+def test_feed_count_is_cached(
+        mixer, user_client, many_posts_with_published_locations):
+    response, counts = count_queries(user_client, '/?page=2')
+    assert counts
+    assert response.context['page_obj'].paginator.count == 20
+
+    response, counts = count_queries(user_client, '/?page=2')
+    assert not counts, (
+        'Убедитесь, что число публикаций в ленте берётся из кеша при'
+        ' повторном запросе.'
+    )
+
+    post = many_posts_with_published_locations[0]
+    mixer.blend(
+        'blog.Post', author=post.author, category=post.category,
+        location=post.location
+    )
+    response, counts = count_queries(user_client, '/?page=2')
+    assert response.context['page_obj'].paginator.count == 21, (
+        'Убедитесь, что кеш числа публикаций сбрасывается при сохранении'
+        ' публикации.'
+    )
@@ -0,0 +1,94 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def image_file(name='photo.jpg', color=(73, 109, 137)):
+    buffer = BytesIO()
+    Image.new('RGB', (40, 40), color=color).save(buffer, 'JPEG')
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+def test_identical_uploads_deduplicated(
+        mixer, user, published_category, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        first, second = (
+            mixer.blend(
+                'blog.Post', author=user, category=published_category,
+                image=image_file(name)
+            )
+            for name in ('first.jpg', 'second.jpg')
+        )
+    assert first.image.name == second.image.name, (
+        'Убедитесь, что одинаковые изображения сохраняются в один файл.'
+    )
+    storage = first.image.storage
+    name = first.image.name
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert storage.exists(name), (
+        'Убедитесь, что файл не удаляется, пока на него ссылается пост.'
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        second.image = image_file(color=(0, 0, 0))
+        second.save()
+    assert not storage.exists(name), (
+        'Убедитесь, что заменённое изображение без ссылок удаляется.'
+    )
+
+
+def test_collect_orphan_images(mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=image_file()
+    )
+    storage = post.image.storage
+    orphan = storage.save('post_images/orphan.jpg', image_file(color=(1, 1, 1)))
+    # Загрузка оборвалась до сохранения поста, отметка истекла.
+    storage.release_claim(orphan)
+    call_command('collect_orphan_images', min_age=0, stdout=None)
+    assert not storage.exists(orphan), (
+        'Убедитесь, что collect_orphan_images удаляет файлы без ссылок.'
+    )
+    assert storage.exists(post.image.name)
+
+
+def test_reupload_survives_concurrent_delete(
+        mixer, user, published_category, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        post = mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            image=image_file()
+        )
+    storage = post.image.storage
+    # Новая загрузка того же файла: имя уже отдано, пост ещё не сохранён.
+    name = storage.save('post_images/again.jpg', image_file())
+    assert name == post.image.name
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert storage.exists(name), (
+        'Убедитесь, что удаление не забирает файл, который только что'
+        ' вернула дедупликация новой загрузке.'
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            image=name
+        )
+    call_command('collect_orphan_images', min_age=0, stdout=None)
+    assert storage.exists(name)
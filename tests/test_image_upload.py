@@ -0,0 +1,114 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_image(size, image_format='JPEG', **options):
+    buffer = BytesIO()
+    Image.new('RGB', size, color=(73, 109, 137)).save(
+        buffer, image_format, **options
+    )
+    return buffer.getvalue()
+
+
+def create_post(client, category, content, name='upload.jpg'):
+    return client.post('/posts/create/', {
+        'title': 'Публикация с картинкой',
+        'text': 'Текст',
+        'pub_date': timezone.localtime().strftime('%Y-%m-%dT%H:%M'),
+        'category': category.id,
+        'image': SimpleUploadedFile(name, content, 'image/jpeg'),
+    })
+
+
+def test_upload_byte_limit(monkeypatch, user_client, published_category):
+    from blog import forms, uploadhandlers
+    from blog.models import Post
+
+    monkeypatch.setattr(uploadhandlers, 'MAX_IMAGE_UPLOAD_SIZE', 1024)
+    monkeypatch.setattr(forms, 'MAX_IMAGE_UPLOAD_SIZE', 1024)
+    content = make_image((500, 500), quality=100)
+    assert len(content) > 1024
+    response = create_post(user_client, published_category, content)
+    assert response.status_code == 200
+    assert 'image' in response.context['form'].errors, (
+        'Убедитесь, что слишком большой файл отклоняется формой.'
+    )
+    assert not Post.objects.exists()
+
+
+def test_upload_pixel_limit(user_client, published_category):
+    from blog.constants import MAX_IMAGE_SIDE
+    from blog.models import Post
+
+    content = make_image((MAX_IMAGE_SIDE + 1, 1), 'PNG')
+    response = create_post(user_client, published_category, content, 'x.png')
+    assert 'image' in response.context['form'].errors, (
+        'Убедитесь, что изображение с огромными габаритами отклоняется.'
+    )
+    assert not Post.objects.exists()
+
+
+def test_upload_metadata_stripped(user_client, published_category):
+    from blog.models import Post
+
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera'
+    content = make_image((50, 50), exif=exif.tobytes())
+    create_post(user_client, published_category, content)
+    post = Post.objects.get()
+    with post.image.open() as stored:
+        image = Image.open(stored)
+        assert 'exif' not in image.info, (
+            'Убедитесь, что из загруженных изображений удаляются EXIF-данные.'
+        )
+        assert image.size == (50, 50)
+    post.image.delete()
+
+
+def stored_image(post):
+    with post.image.open() as stored:
+        content = stored.read()
+    post.image.delete()
+    return Image.open(BytesIO(content))
+
+
+def test_upload_orientation_applied(user_client, published_category):
+    from blog.models import Post
+
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    content = make_image((60, 20), exif=exif.tobytes())
+    create_post(user_client, published_category, content)
+    image = stored_image(Post.objects.get())
+    assert image.size == (20, 60), (
+        'Убедитесь, что поворот из EXIF Orientation применяется к'
+        ' изображению до удаления метаданных.'
+    )
+    assert 'exif' not in image.info
+
+
+def test_upload_animation_kept(user_client, published_category):
+    from blog.models import Post
+
+    frames = [
+        Image.new('RGB', (30, 30), color) for color in ('red', 'green', 'blue')
+    ]
+    buffer = BytesIO()
+    frames[0].save(
+        buffer, 'GIF', save_all=True, append_images=frames[1:],
+        duration=100, loop=0, comment=b'secret'
+    )
+    create_post(
+        user_client, published_category, buffer.getvalue(), 'anim.gif'
+    )
+    image = stored_image(Post.objects.get())
+    assert getattr(image, 'n_frames', 1) == 3, (
+        'Убедитесь, что при удалении метаданных анимация сохраняет все кадры.'
+    )
+    assert 'comment' not in image.info
@@ -0,0 +1,44 @@
+import pytest
+from django.db import connection
+
+from blog.models import Post
+from blog.services import comment_counter, common_filter
+
+pytestmark = [pytest.mark.django_db]
+
+
+def feed_querysets(user, category):
+    return {
+        'post_published_feed_idx': common_filter(
+            comment_counter(Post.objects)
+        ),
+        'post_category_feed_idx': common_filter(
+            comment_counter(category.posts)
+        ),
+        'post_author_feed_idx': comment_counter(user.posts),
+    }
+
+
+@pytest.mark.parametrize(
+    'index_name',
+    (
+        'post_published_feed_idx',
+        'post_category_feed_idx',
+        'post_author_feed_idx',
+    ),
+)
+def test_feed_query_uses_index(index_name, user, published_category):
+    queryset = feed_querysets(user, published_category)[index_name][:10]
+    if connection.vendor == 'sqlite':
+        plan = queryset.explain()
+        assert f'USING INDEX {index_name}' in plan, plan
+        assert 'SCAN blog_post' not in plan, plan
+        assert 'TEMP B-TREE' not in plan, plan
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+        assert index_name in plan, plan
+        assert 'Seq Scan on blog_post' not in plan, plan
+    else:
+        pytest.skip(f'Нет проверки плана для {connection.vendor}')
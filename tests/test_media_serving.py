@@ -0,0 +1,95 @@
+from urllib.parse import unquote
+
+import pytest
+
+HASHED = 'a' * 64 + '.jpg'
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / 'posts_images').mkdir()
+    (tmp_path / 'posts_images' / HASHED).write_bytes(CONTENT)
+    (tmp_path / 'plain.txt').write_bytes(CONTENT)
+    return tmp_path
+
+
+def body(response):
+    return b''.join(response.streaming_content)
+
+
+def test_hashed_media_is_immutable(client):
+    response = client.get(f'/media/posts_images/{HASHED}')
+    assert response.status_code == 200
+    assert body(response) == CONTENT
+    assert 'immutable' in response['Cache-Control'], (
+        'Убедитесь, что файлы с хешем в имени кешируются как неизменяемые.'
+    )
+    assert response['ETag'] == f'"{HASHED}"'
+    assert response['Accept-Ranges'] == 'bytes'
+
+
+def test_plain_media_is_revalidated(client):
+    response = client.get('/media/plain.txt')
+    assert response.status_code == 200
+    assert 'immutable' not in response['Cache-Control']
+    repeated = client.get(
+        '/media/plain.txt', HTTP_IF_NONE_MATCH=response['ETag']
+    )
+    assert repeated.status_code == 304, (
+        'Убедитесь, что при совпадении ETag возвращается 304.'
+    )
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-9', CONTENT[:10]),
+    ('bytes=1000-', CONTENT[1000:]),
+    ('bytes=-5', CONTENT[-5:]),
+])
+def test_range_request(client, header, expected):
+    response = client.get(f'/media/posts_images/{HASHED}', HTTP_RANGE=header)
+    assert response.status_code == 206, (
+        'Убедитесь, что запрос с Range возвращает часть файла.'
+    )
+    assert body(response) == expected
+    assert response['Content-Length'] == str(len(expected))
+
+
+def test_unsatisfiable_range(client):
+    response = client.get(
+        f'/media/posts_images/{HASHED}', HTTP_RANGE='bytes=5000-'
+    )
+    assert response.status_code == 416
+    assert response['Content-Range'] == f'bytes */{len(CONTENT)}'
+
+
+def test_accel_redirect(client, settings):
+    settings.MEDIA_SERVE_MODE = 'x-accel-redirect'
+    response = client.get(f'/media/posts_images/{HASHED}')
+    assert response['X-Accel-Redirect'] == (
+        f'/protected-media/posts_images/{HASHED}'
+    )
+
+
+@pytest.mark.parametrize('mode, header, prefix', (
+    ('x-accel-redirect', 'X-Accel-Redirect', '/protected-media/'),
+    ('x-sendfile', 'X-Sendfile', None),
+))
+def test_offloaded_non_ascii_name(client, settings, media_root,
+                                  mode, header, prefix):
+    settings.MEDIA_SERVE_MODE = mode
+    (media_root / 'posts_images' / 'фото 1.jpg').write_bytes(CONTENT)
+    response = client.get('/media/posts_images/фото 1.jpg')
+    value = response[header]
+    assert value.isascii() and '=?utf-8?' not in value, (
+        'Убедитесь, что путь для веб-сервера передаётся в %-кодировке,'
+        ' а не в MIME-кодировке заголовка.'
+    )
+    expected = (prefix or f'{media_root}/') + 'posts_images/фото 1.jpg'
+    assert unquote(value) == expected
+
+
+@pytest.mark.parametrize('path', ['missing.jpg', '../secret.txt', ''])
+def test_missing_media(client, path):
+    assert client.get(f'/media/{path}').status_code == 404
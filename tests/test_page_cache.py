@@ -0,0 +1,40 @@
+import pytest
+from django.db.models import F
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(ANONYMOUS_PAGE_CACHE_TIMEOUT=60)
+@pytest.mark.parametrize(
+    'url_func',
+    (
+        lambda post: '/',
+        lambda post: f'/category/{post.category.slug}/',
+        lambda post: f'/profile/{post.author.username}/',
+    ),
+)
+def test_anonymous_feed_page_cache(
+        url_func, mixer, unlogged_client, user_client,
+        post_with_published_location):
+    post = post_with_published_location
+    url = url_func(post)
+    unlogged_client.get(url)
+    type(post).objects.filter(pk=post.pk).update(
+        title='Без сохранения',
+        comment_count=F('comment_count') + 7
+    )
+    assert 'Без сохранения' not in unlogged_client.get(url).content.decode(), (
+        'Убедитесь, что страница ленты для анонимного посетителя берётся из'
+        ' кеша.'
+    )
+    assert 'Без сохранения' in user_client.get(url).content.decode(), (
+        'Убедитесь, что авторизованные пользователи получают ленту без'
+        ' кеширования.'
+    )
+
+    mixer.blend('blog.Comment', post=post)
+    assert 'Без сохранения' in unlogged_client.get(url).content.decode(), (
+        'Убедитесь, что кеш страниц ленты сбрасывается при добавлении'
+        ' комментария.'
+    )
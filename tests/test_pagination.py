@@ -0,0 +1,73 @@
+import base64
+import json
+
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(KEYSET_PAGINATION_VIEWS=('index',))
+def test_keyset_pagination(
+        user_client, many_posts_with_published_locations):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    first_page = user_client.get('/').context['page_obj']
+    assert getattr(first_page, 'is_keyset', False), (
+        'Убедитесь, что при включённой курсорной пагинации главная страница'
+        ' передаёт в контекст страницу, построенную по курсору.'
+    )
+    assert list(first_page) == expected[:N_PER_PAGE]
+    assert first_page.has_next() and not first_page.has_previous()
+
+    second_page = user_client.get(
+        '/', {'cursor': first_page.next_cursor}
+    ).context['page_obj']
+    assert list(second_page) == expected[N_PER_PAGE:N_PER_PAGE * 2], (
+        'Убедитесь, что курсор следующей страницы возвращает следующие'
+        ' публикации ленты.'
+    )
+    assert second_page.has_previous()
+
+    previous_page = user_client.get(
+        '/', {'cursor': second_page.previous_cursor}
+    ).context['page_obj']
+    assert list(previous_page) == expected[:N_PER_PAGE]
+
+    last_page = user_client.get(
+        '/', {'cursor': first_page.last_cursor}
+    ).context['page_obj']
+    assert list(last_page) == expected[-N_PER_PAGE:]
+
+
+@override_settings(KEYSET_PAGINATION_VIEWS=('index',))
+def test_keyset_pagination_keeps_page_urls(
+        user_client, many_posts_with_published_locations):
+    page_obj = user_client.get('/', {'page': 2}).context['page_obj']
+    assert page_obj.number == 2, (
+        'Убедитесь, что ссылки вида `?page=N` продолжают работать при'
+        ' включённой курсорной пагинации.'
+    )
+
+    crafted = [
+        ['next', ['garbage', 'x']],
+        ['prev', [None, 'x']],
+        ['next', 'ab'],
+        {'next': 1, 'x': 2},
+    ]
+    cursors = ['broken'] + [
+        base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        for payload in crafted
+    ]
+    for cursor in cursors:
+        response = user_client.get('/', {'cursor': cursor})
+        assert response.status_code == 200, (
+            'Убедитесь, что курсор с некорректными значениями полей'
+            ' не приводит к ошибке сервера.'
+        )
+        assert len(response.context['page_obj']) == N_PER_PAGE
@@ -0,0 +1,52 @@
+import pytest
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_fragment_cache(
+        unlogged_client, post_with_published_location):
+    post = post_with_published_location
+    assert post.title in unlogged_client.get('/').content.decode()
+
+    type(post).objects.filter(pk=post.pk).update(title='Без сохранения')
+    assert 'Без сохранения' not in unlogged_client.get('/').content.decode(), (
+        'Убедитесь, что карточка публикации берётся из кеша фрагментов.'
+    )
+
+    post.refresh_from_db()
+    post.title = 'После сохранения'
+    post.save()
+    assert 'После сохранения' in unlogged_client.get('/').content.decode(), (
+        'Убедитесь, что кеш карточки сбрасывается при сохранении публикации.'
+    )
+
+    category = post.category
+    category.title = 'Новая категория'
+    category.save()
+    assert 'Новая категория' in unlogged_client.get('/').content.decode(), (
+        'Убедитесь, что кеш карточки сбрасывается при сохранении категории.'
+    )
+
+
+@override_settings(ANONYMOUS_PAGE_CACHE_TIMEOUT=60)
+def test_username_change_refreshes_cards_and_pages(
+        user, user_client, unlogged_client, post_with_published_location):
+    post = post_with_published_location
+    post_url = f'/posts/{post.id}/'
+    unlogged_client.get('/')
+    etag = unlogged_client.get(post_url)['ETag']
+    user_client.post('/profile/edit', {
+        'username': 'renamed_author',
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'email': user.email,
+    })
+    content = unlogged_client.get('/').content.decode()
+    assert '/profile/renamed_author/' in content, (
+        'Убедитесь, что после смены имени автора карточки и кеш страниц'
+        ' показывают новое имя.'
+    )
+    assert unlogged_client.get(post_url)['ETag'] != etag, (
+        'Убедитесь, что смена имени автора меняет ETag страницы поста.'
+    )
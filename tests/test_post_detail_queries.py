@@ -0,0 +1,43 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+ANONYMOUS_QUERY_BUDGET = 2
+AUTHORIZED_QUERY_BUDGET = 4
+
+
+def count_detail_queries(client, post):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(f'/posts/{post.id}/')
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.parametrize(
+    'client_fixture, budget',
+    (
+        ('unlogged_client', ANONYMOUS_QUERY_BUDGET),
+        ('user_client', AUTHORIZED_QUERY_BUDGET),
+        ('another_user_client', AUTHORIZED_QUERY_BUDGET),
+    ),
+)
+def test_post_detail_query_budget(
+        request, client_fixture, budget, mixer,
+        post_with_published_location):
+    client = request.getfixturevalue(client_fixture)
+    post = post_with_published_location
+    mixer.blend('blog.Comment', post=post)
+    count_detail_queries(client, post)
+    few_comments = count_detail_queries(client, post)
+    mixer.cycle(10).blend('blog.Comment', post=post)
+    many_comments = count_detail_queries(client, post)
+    assert few_comments == many_comments, (
+        'Убедитесь, что число запросов к БД на странице публикации не'
+        ' зависит от числа комментариев.'
+    )
+    assert many_comments <= budget, (
+        'Убедитесь, что страница публикации загружается не более чем за'
+        f' {budget} запроса к БД.'
+    )
@@ -0,0 +1,95 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(PUBLICATION_CLOCK_GRANULARITY=60)
+def test_publication_clock_granularity(monkeypatch):
+    from blog import clock
+
+    current = datetime(2024, 5, 4, 12, 30, 45, 123456, tzinfo=timezone.utc)
+    monkeypatch.setattr(clock, 'now', lambda: current)
+    assert clock.publication_clock() == current.replace(
+        second=0, microsecond=0
+    ), (
+        'Убедитесь, что часы публикаций округляются вниз до заданного шага.'
+    )
+
+
+@override_settings(
+    ANONYMOUS_PAGE_CACHE_TIMEOUT=60, PUBLICATION_CLOCK_GRANULARITY=60
+)
+def test_scheduled_post_appears_in_cached_feed(
+        monkeypatch, mixer, unlogged_client, post_with_published_location):
+    from blog import clock
+
+    current = clock.now()
+    monkeypatch.setattr(clock, 'now', lambda: current)
+    post = post_with_published_location
+    scheduled = mixer.blend(
+        'blog.Post',
+        author=post.author,
+        category=post.category,
+        location=post.location,
+        pub_date=current + timedelta(minutes=5),
+    )
+    assert scheduled.title not in unlogged_client.get('/').content.decode()
+
+    monkeypatch.setattr(
+        clock, 'now', lambda: current + timedelta(minutes=4, seconds=59)
+    )
+    assert scheduled.title not in unlogged_client.get('/').content.decode(), (
+        'Убедитесь, что отложенная публикация не появляется раньше срока.'
+    )
+
+    monkeypatch.setattr(clock, 'now', lambda: current + timedelta(minutes=7))
+    assert scheduled.title in unlogged_client.get('/').content.decode(), (
+        'Убедитесь, что кеш ленты сбрасывается, когда наступает срок'
+        ' отложенной публикации.'
+    )
+
+
+def test_scheduling_during_release_is_not_lost(
+        monkeypatch, mixer, django_capture_on_commit_callbacks,
+        post_with_published_location):
+    from django.core.cache import cache
+
+    from blog import cache as blog_cache
+
+    post = post_with_published_location
+    with django_capture_on_commit_callbacks() as callbacks:
+        scheduled = mixer.blend(
+            'blog.Post', author=post.author, category=post.category,
+            pub_date=blog_cache.publication_clock() + timedelta(hours=1),
+        )
+    queried, finish_query = threading.Event(), threading.Event()
+
+    def stale_query(clock):
+        # Запрос выполнен до фиксации отложенного поста.
+        queried.set()
+        finish_query.wait(5)
+        return blog_cache.NO_SCHEDULED_POSTS
+
+    monkeypatch.setattr(blog_cache, 'upcoming_publication', stale_query)
+    release = threading.Thread(
+        target=blog_cache.release_scheduled_posts, args=(None,)
+    )
+    release.start()
+    queried.wait(5)
+    schedule = threading.Thread(
+        target=lambda: [callback() for callback in callbacks]
+    )
+    schedule.start()
+    finish_query.set()
+    release.join(5)
+    schedule.join(5)
+    assert cache.get(blog_cache.NEXT_PUBLICATION_KEY) == (
+        scheduled.pub_date.timestamp()
+    ), (
+        'Убедитесь, что пересчёт ближайшей публикации не затирает'
+        ' отметку поста, сохранённого во время пересчёта.'
+    )
@@ -0,0 +1,72 @@
+import threading
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(REQUEST_STATS_FLUSH_EVERY=1)
+def test_request_stats_collected(user_client, post_with_published_location):
+    from core.instrumentation import reset, summary
+
+    reset()
+    for _ in range(3):
+        user_client.get('/')
+    user_client.get('/pages/about/')
+    stats = summary()
+    assert stats['blog:index']['requests'] == 3, (
+        'Убедитесь, что статистика запросов собирается для представлений'
+        ' блога.'
+    )
+    assert 'pages:about' in stats
+    assert stats['blog:index']['queries']['p50'] > 0
+    assert stats['blog:index']['template_ms']['p50'] > 0
+
+    out = StringIO()
+    call_command('request_stats', stdout=out)
+    assert 'blog:index' in out.getvalue()
+
+
+@override_settings(REQUEST_STATS_N_PLUS_ONE_THRESHOLD=3)
+def test_n_plus_one_detection():
+    from core.instrumentation import RequestStats
+
+    stats = RequestStats()
+    execute = lambda sql, params, many, context: None  # noqa: E731
+    for pk in range(5):
+        stats(execute, 'SELECT * FROM auth_user WHERE id = %s', (pk,),
+              False, {})
+    stats(execute, 'SELECT 1', (), False, {})
+    assert stats.repeated_statements() == [
+        ('SELECT * FROM auth_user WHERE id = %s', 5)
+    ]
+
+
+def test_concurrent_flushes_keep_all_samples():
+    from core.instrumentation import flush, reset, summary
+
+    reset()
+    sample = (1.0, 1, 0.5, 0.5, 100, False)
+    threads = [
+        threading.Thread(target=flush, args=({'blog:index': [sample] * 5},))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert summary()['blog:index']['requests'] == 40, (
+        'Убедитесь, что замеры разных процессов не затирают друг друга.'
+    )
+
+
+def test_request_stats_warns_about_local_cache():
+    err = StringIO()
+    call_command('request_stats', stdout=StringIO(), stderr=err)
+    assert 'REQUEST_STATS_CACHE_ALIAS' in err.getvalue(), (
+        'Убедитесь, что команда предупреждает, если замеры хранятся'
+        ' в локальном для процесса кеше.'
+    )
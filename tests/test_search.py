@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.search import stem
+
+pytestmark = [pytest.mark.django_db]
+
+
+def found(client, query):
+    response = client.get('/search/', {'q': query})
+    assert response.status_code == 200
+    return [post.title for post in response.context['page_obj']]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    past = timezone.now() - timedelta(days=1)
+    return [
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=True, pub_date=past, title=title, text=text
+        )
+        for title, text in (
+            ('Кошки', 'Про домашних кошек и котят.'),
+            ('Собаки', 'Собака — друг человека, кошка тоже.'),
+            ('Погода', 'Сегодня солнечно.'),
+        )
+    ]
+
+
+@pytest.mark.parametrize('word, expected', [
+    ('кошками', 'кошк'),
+    ('публикации', 'публикац'),
+    ('Ёлки', 'елк'),
+    ('django', 'django'),
+])
+def test_stem(word, expected):
+    assert stem(word) == expected
+
+
+def test_search_uses_word_forms_and_rank(client, posts):
+    assert found(client, 'кошка') == ['Кошки', 'Собаки'], (
+        'Убедитесь, что поиск находит другие формы слова и выше ставит'
+        ' более релевантные публикации.'
+    )
+    assert found(client, 'солнечная погода') == ['Погода']
+    assert found(client, '') == []
+
+
+def test_search_respects_visibility(client, posts):
+    posts[0].is_published = False
+    posts[0].save()
+    posts[2].pub_date = timezone.now() + timedelta(days=1)
+    posts[2].save()
+    assert found(client, 'кошки') == ['Собаки']
+    assert found(client, 'погода') == [], (
+        'Убедитесь, что поиск не показывает отложенные публикации.'
+    )
+
+
+def test_search_index_follows_changes(client, posts):
+    posts[1].text = 'Про попугаев.'
+    posts[1].save()
+    posts[0].delete()
+    assert found(client, 'кошка') == []
+    assert found(client, 'попугай') == ['Собаки']
+
+
+def test_admin_search(admin_client, posts):
+    response = admin_client.get(
+        '/admin/blog/post/', {'q': 'котята'}
+    )
+    assert [post.title for post in response.context['cl'].result_list] == [
+        'Кошки'
+    ]
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from core.checks import debug_overhead
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+
+def run_profile(code, **env):
+    return subprocess.run(
+        [sys.executable, '-c', f'import django; django.setup(); {code}'],
+        cwd=PROJECT_DIR,
+        env={
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'blogicum.settings',
+            'DJANGO_SECRET_KEY': 'test',
+            **env,
+        },
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+def test_dev_profile_reports_debug_overhead():
+    problems = ' '.join(debug_overhead())
+    assert 'debug_toolbar' in problems
+    assert 'без кеширования' in problems
+
+
+def test_prod_profile_has_no_debug_overhead(tmp_path):
+    result = run_profile(
+        'from django.conf import settings;'
+        ' from core.checks import debug_overhead;'
+        ' print(settings.SETTINGS_PROFILE, debug_overhead())',
+        DJANGO_ENV='prod',
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == 'prod []', (
+        'Убедитесь, что профиль prod не включает отладочные приложения,'
+        ' промежуточные слои и некешируемые загрузчики шаблонов.'
+    )
+
+
+def test_prod_profile_fails_with_debug_overhead(tmp_path):
+    (tmp_path / 'debug_prod_settings.py').write_text(
+        'from blogicum.settings.prod import *\nDEBUG = True\n'
+    )
+    result = run_profile(
+        '', DJANGO_ENV='prod',
+        DJANGO_SETTINGS_MODULE='debug_prod_settings',
+        PYTHONPATH=f'{tmp_path}{os.pathsep}{PROJECT_DIR}',
+    )
+    assert result.returncode != 0
+    assert 'ImproperlyConfigured' in result.stderr, (
+        'Убедитесь, что профиль prod не запускается с DEBUG = True.'
+    )
+
+
+def test_prod_gzip_skips_media(tmp_path):
+    (tmp_path / 'photo.jpg').write_bytes(bytes(range(256)) * 20)
+    result = run_profile(
+        'from django.conf import settings;'
+        ' from django.test import Client;'
+        f' settings.MEDIA_ROOT = {str(tmp_path)!r};'
+        ' client = Client(HTTP_ACCEPT_ENCODING="gzip");'
+        ' part = client.get("/media/photo.jpg", HTTP_RANGE="bytes=0-999");'
+        ' full = client.get("/media/photo.jpg");'
+        ' page = client.get("/pages/about/");'
+        ' print(part.status_code, len(b"".join(part.streaming_content)),'
+        ' part.get("Content-Encoding"), full.get("Content-Encoding"),'
+        ' page.get("Content-Encoding"))',
+        DJANGO_ENV='prod',
+        DJANGO_ALLOWED_HOSTS='testserver',
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ['206', '1000', 'None', 'None', 'gzip'], (
+        'Убедитесь, что в профиле prod сжимаются только текстовые ответы,'
+        ' а файлы медиа и ответы 206 отдаются без Content-Encoding.'
+    )
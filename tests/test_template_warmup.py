@@ -0,0 +1,34 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+
+from core.templates import warm_templates
+
+
+def test_warm_templates_compiles_project_templates():
+    names = [name for name, _ in warm_templates()]
+    for name in ('base.html', 'includes/header.html',
+                 'includes/post_card.html', 'blog/index.html'):
+        assert name in names, (
+            f'Убедитесь, что шаблон `{name}` компилируется при прогреве.'
+        )
+
+
+def test_warm_templates_fills_cached_loader(settings):
+    engine = engines['django'].engine
+    loader = CachedLoader(engine, settings.TEMPLATE_LOADERS)
+    original = engine.template_loaders
+    engine.template_loaders = [loader]
+    try:
+        warm_templates()
+    finally:
+        engine.template_loaders = original
+    assert 'base.html' in loader.get_template_cache
+
+
+def test_warm_templates_command():
+    out = StringIO()
+    call_command('warm_templates', stdout=out)
+    assert 'includes/post_card.html' in out.getvalue()
@@ -0,0 +1,97 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from PIL import Image
+from PIL import ImageFile as PILImageFile
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_with_large_image(mixer, user, published_location, published_category):
+    img_io = BytesIO()
+    Image.new('RGB', (1000, 500), color=(73, 109, 137)).save(img_io, 'JPEG')
+    post = mixer.blend(
+        'blog.Post',
+        location=published_location,
+        category=published_category,
+        author=user,
+        image=ImageFile(img_io, name='large_image.jpg'),
+    )
+    yield post
+    from blog.thumbnails import variant_names
+
+    storage = post.image.storage
+    for name in variant_names(post.image.name) + [post.image.name]:
+        storage.delete(name)
+
+
+def test_thumbnails_generated(unlogged_client, post_with_large_image):
+    from blog.thumbnails import generate_thumbnails, variant_name
+
+    post = post_with_large_image
+    content = unlogged_client.get('/').content.decode()
+    assert 'srcset' not in content, (
+        'Убедитесь, что до создания миниатюр показывается оригинал.'
+    )
+
+    generate_thumbnails(post.image.name)
+    storage = post.image.storage
+    small = variant_name(post.image.name, 320, 'webp')
+    assert storage.exists(small)
+    assert not storage.exists(variant_name(post.image.name, 1280, 'jpg')), (
+        'Убедитесь, что миниатюры не больше оригинала.'
+    )
+    with storage.open(small) as thumbnail:
+        assert Image.open(thumbnail).size == (320, 160)
+
+    content = unlogged_client.get('/').content.decode()
+    assert f'{storage.url(small)} 320w' in content, (
+        'Убедитесь, что после создания миниатюр лента использует srcset.'
+    )
+    assert post.image.url in content
+
+
+def test_existing_thumbnails_skip_work(monkeypatch, post_with_large_image):
+    from blog import thumbnails
+    from blog.cache import get_feed_version, post_feed
+
+    post = post_with_large_image
+    thumbnails.generate_thumbnails(post.image.name)
+    post.refresh_from_db()
+    updated_at = post.updated_at
+    version = get_feed_version(post_feed(post.id))
+
+    def fail_load(self):
+        raise AssertionError('Оригинал декодирован повторно.')
+
+    monkeypatch.setattr(PILImageFile.ImageFile, 'load', fail_load)
+    thumbnails.generate_thumbnails(post.image.name)
+    post.refresh_from_db()
+    assert post.updated_at == updated_at, (
+        'Убедитесь, что при готовых миниатюрах пост не помечается'
+        ' изменённым.'
+    )
+    assert get_feed_version(post_feed(post.id)) == version
+
+
+def test_text_edit_does_not_queue_thumbnails(
+        monkeypatch, user_client, post_with_large_image,
+        django_capture_on_commit_callbacks):
+    from blog import thumbnails
+
+    submitted = []
+    monkeypatch.setattr(thumbnails, 'submit', submitted.append)
+    post = post_with_large_image
+    with django_capture_on_commit_callbacks(execute=True):
+        response = user_client.post(f'/posts/{post.id}/edit/', {
+            'title': post.title,
+            'text': 'Новый текст',
+            'pub_date': post.pub_date.strftime('%Y-%m-%dT%H:%M'),
+            'category': post.category_id,
+        })
+    assert response.status_code == 302
+    assert not submitted, (
+        'Убедитесь, что правка текста не ставит в очередь миниатюры.'
+    )